@@ -5,6 +5,9 @@ import boto3
 s3 = boto3.client("s3")
 sqs = boto3.client("sqs")
 
+# Max entries of an SQS SendMessageBatch request
+SQS_BATCH_SIZE = 10
+
 
 def lambda_handler(event, context):
     bucket = os.environ["BUCKET_NAME"]
@@ -16,8 +19,20 @@ def lambda_handler(event, context):
     content = response["Body"].read().decode("utf-8")
     links = [line.strip() for line in content.split("\n") if line.strip()]
 
-    # Send to SQS
-    for link in links:
-        sqs.send_message(QueueUrl=queue_url, MessageBody=link)
+    # Send to SQS, one request per batch of links
+    failed = []
+    for start in range(0, len(links), SQS_BATCH_SIZE):
+        batch = links[start : start + SQS_BATCH_SIZE]
+        response = sqs.send_message_batch(
+            QueueUrl=queue_url,
+            Entries=[
+                {"Id": str(index), "MessageBody": link}
+                for index, link in enumerate(batch)
+            ],
+        )
+        failed.extend(batch[int(entry["Id"])] for entry in response.get("Failed", []))
+
+    if failed:
+        raise RuntimeError(f"Failed to send {len(failed)} link(s) to SQS: {failed}")
 
     return f"Successfully sent {len(links)} links to SQS"
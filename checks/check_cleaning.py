@@ -0,0 +1,94 @@
+"""
+Golden-output check of utils.cleaning.clean_text, the feature pipeline text cleaner.
+
+Every case of fixtures/cleaning.json must be cleaned to its expected output. With --benchmark, clean_text
+is also compared with and timed against the original multi-pass cleaner on real chapters, read from
+the NICE_GUIDELINE Mongo collection or from a JSON export of it (--input).
+"""
+
+import argparse
+import json
+import timeit
+from pathlib import Path
+
+from utils.cleaning import clean_text, clean_texts
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "cleaning.json"
+
+
+def check_fixture() -> None:
+    cases = json.loads(FIXTURE_PATH.read_text(encoding="utf-8"))
+    assert cases, f"No cases found in {FIXTURE_PATH}"
+
+    for case in cases:
+        output = clean_text(case["input"])
+        assert output == case["expected"], (
+            f"clean_text({case['input']!r}) = {output!r}, expected {case['expected']!r}"
+        )
+
+    assert clean_texts([case["input"] for case in cases]) == [
+        case["expected"] for case in cases
+    ], "clean_texts doesn't match clean_text"
+
+    print(f"OK {FIXTURE_PATH.name} ({len(cases)} cases)")
+
+
+def load_chapters(input_path: Path | None) -> list[str]:
+    if input_path is not None:
+        documents = json.loads(input_path.read_text(encoding="utf-8"))
+    else:
+        from core.db.documents import NiceDocument
+
+        # Only the chapter markdown is needed, streamed in batches
+        documents = (
+            document.model_dump()
+            for document in NiceDocument.iter_all(projection={"chapters.markdown": 1})
+        )
+
+    return [
+        chapter["markdown"]
+        for document in documents
+        for chapter in document.get("chapters", [])
+        if chapter and chapter.get("markdown")
+    ]
+
+
+def benchmark(chapters: list[str], repeat: int) -> None:
+    from cleaning_reference import clean_text_legacy
+
+    for index, chapter in enumerate(chapters):
+        assert clean_text(chapter) == clean_text_legacy(chapter), (
+            f"Output mismatch with the reference cleaner for chapter {index}"
+        )
+
+    num_chars = sum(len(chapter) for chapter in chapters)
+    for cleaner in (clean_text_legacy, clean_text):
+        seconds = min(
+            timeit.repeat(
+                lambda cleaner=cleaner: [cleaner(chapter) for chapter in chapters],
+                number=1,
+                repeat=repeat,
+            )
+        )
+        chars_per_second = int(num_chars / seconds) if seconds else None
+        print(
+            f"{cleaner.__name__}: {len(chapters)} chapter(s), {num_chars} chars, "
+            f"{seconds:.4f}s, {chars_per_second} chars/s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=None,
+        help="JSON list of NICE documents with their chapters. Defaults to reading MongoDB.",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    check_fixture()
+    if args.benchmark:
+        benchmark(load_chapters(args.input), repeat=args.repeat)
@@ -0,0 +1,169 @@
+"""
+Golden-output check of the lxml NICE extractors of the data crawler.
+
+Every fixtures/extractors/*.html page must be extracted to its saved golden output (<name>.md for
+chapter pages, <name>.json for guideline pages). With --benchmark, the extractors are also timed
+against the BeautifulSoup implementation they replaced, which generates the golden outputs.
+
+The hand-written pages cover the branches of the extractors. The real NICE pages listed in
+fixtures/extractors/pages.txt are saved next to them, as html.parser and lxml repair real-world
+markup differently, and --save without URLs captures them again.
+
+    python checks/run.py extractors --benchmark
+    python checks/run.py extractors --save
+    python checks/run.py extractors --save https://www.nice.org.uk/guidance/ng106/chapter/Recommendations
+    python checks/run.py extractors --update-golden
+"""
+
+import argparse
+import json
+import timeit
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from extractors import extract_chapter_markdown, extract_guideline
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "extractors"
+PAGES_PATH = FIXTURES_DIR / "pages.txt"
+
+
+def get_extractor(fixture: Path):
+    """Guideline pages are named guideline_*.html, every other fixture is a chapter page."""
+    if fixture.stem.startswith("guideline"):
+        return extract_guideline, ".json"
+
+    return extract_chapter_markdown, ".md"
+
+
+def get_reference(fixture: Path):
+    from extractors_reference import parse_chapter_markdown, parse_guideline_page
+
+    if fixture.stem.startswith("guideline"):
+        return parse_guideline_page
+
+    return parse_chapter_markdown
+
+
+def to_golden(output) -> str:
+    if isinstance(output, str):
+        return output
+
+    return json.dumps(output, indent=2, ensure_ascii=False) + "\n"
+
+
+def get_fixture_path(url: str) -> Path:
+    name = urlsplit(url).path.strip("/").replace("/", "_") or "index"
+    if "/chapter/" not in url:
+        name = f"guideline_{name}"
+
+    return FIXTURES_DIR / f"{name}.html"
+
+
+def load_pages() -> list[str]:
+    return [
+        line.strip()
+        for line in PAGES_PATH.read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    ]
+
+
+def save_fixture(url: str) -> None:
+    import httpx
+
+    response = httpx.get(url, follow_redirects=True)
+    response.raise_for_status()
+
+    fixture = get_fixture_path(url)
+    fixture.write_text(response.text, encoding="utf-8")
+    print(f"Saved {url} to {fixture}")
+
+
+def update_golden() -> None:
+    for fixture in sorted(FIXTURES_DIR.glob("*.html")):
+        _, suffix = get_extractor(fixture)
+        golden_path = fixture.with_suffix(suffix)
+        reference = get_reference(fixture)
+
+        golden_path.write_text(
+            to_golden(reference(fixture.read_text(encoding="utf-8"))), encoding="utf-8"
+        )
+        print(f"Wrote golden output {golden_path.name}")
+
+
+def check_fixtures() -> None:
+    fixtures = sorted(FIXTURES_DIR.glob("*.html"))
+    assert fixtures, f"No fixtures found in {FIXTURES_DIR}"
+
+    for fixture in fixtures:
+        extract, suffix = get_extractor(fixture)
+        golden_path = fixture.with_suffix(suffix)
+        assert golden_path.exists(), (
+            f"No golden output for {fixture.name}, run with --update-golden"
+        )
+
+        output = to_golden(extract(fixture.read_text(encoding="utf-8")))
+        assert output == golden_path.read_text(encoding="utf-8"), (
+            f"{extract.__name__} doesn't match {golden_path.name}"
+        )
+
+        print(f"OK {fixture.name}")
+
+    for url in load_pages():
+        if not get_fixture_path(url).exists():
+            print(
+                f"WARNING {url} isn't saved, the extractors are only checked on hand-written pages. "
+                "Save it with --save."
+            )
+
+
+def benchmark(repeat: int, number: int) -> None:
+    for fixture in sorted(FIXTURES_DIR.glob("*.html")):
+        html = fixture.read_text(encoding="utf-8")
+        extract, _ = get_extractor(fixture)
+
+        timings = {
+            extractor.__module__: min(
+                timeit.repeat(
+                    lambda extractor=extractor: extractor(html),
+                    number=number,
+                    repeat=repeat,
+                )
+            )
+            / number
+            for extractor in (get_reference(fixture), extract)
+        }
+        print(
+            fixture.name,
+            " ".join(
+                f"{name}={seconds * 1000:.3f}ms" for name, seconds in timings.items()
+            ),
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument(
+        "--save",
+        nargs="*",
+        default=None,
+        help=f"NICE page URLs to save as fixtures. Defaults to the pages of {PAGES_PATH.name}.",
+    )
+    parser.add_argument(
+        "--update-golden",
+        action="store_true",
+        help="Rewrite the golden outputs with the reference implementation.",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.save is not None:
+        for url in args.save or load_pages():
+            save_fixture(url)
+    if args.save is not None or args.update_golden:
+        update_golden()
+
+    check_fixtures()
+    if args.benchmark:
+        benchmark(repeat=args.repeat, number=args.number)
@@ -0,0 +1,205 @@
+"""
+Reference BeautifulSoup implementation of the NICE extractors, the one they replaced in the crawler.
+The golden outputs of fixtures/extractors are generated with it.
+"""
+
+from bs4 import BeautifulSoup
+from extractors.nice import NICE_BASE_URL
+
+
+def parse_guideline_page(html: str) -> dict:
+    """Extract the title, last updated date and chapter links of a NICE guideline page."""
+    soup = BeautifulSoup(html, "html.parser")
+    title_element = soup.find("h1", class_="page-header__heading")
+    title = title_element.text.strip() if title_element else "Unknown Title"
+
+    # Extract last updated date
+    published_date = None
+    last_updated = None
+    metadata = soup.find("ul", class_="page-header__metadata")
+    if metadata:
+        # Look for the "Last updated" list item
+        for li in metadata.find_all("li"):
+            if "Last updated" in li.text:
+                # Extract the datetime from the time element
+                time_element = li.find("time")
+                if time_element and time_element.has_attr("datetime"):
+                    last_updated = time_element["datetime"]
+                else:
+                    # If no datetime attribute, extract the text
+                    last_updated = li.text.replace("Last updated:", "").strip()
+
+            if "Published" in li.text:
+                # Extract the datetime from the time element
+                time_element = li.find("time")
+                if time_element and time_element.has_attr("datetime"):
+                    published_date = time_element["datetime"]
+                else:
+                    # If no datetime attribute, extract the text
+                    published_date = li.text.replace("Published:", "").strip()
+    if last_updated is None:
+        last_updated = published_date
+
+    # Extract chapters navigation
+    chapters = []
+    nav_list = soup.find("ul", class_="stacked-nav__list")
+    if nav_list:
+        for chapter_link in nav_list.find_all("a"):
+            chapter_url = NICE_BASE_URL + chapter_link["href"]
+            chapter_title = chapter_link.find(
+                "span", class_="stacked-nav__content-wrapper"
+            ).text.strip()
+            chapters.append((chapter_title, chapter_url))
+
+    return {"title": title, "last_updated": last_updated, "chapters": chapters}
+
+
+def parse_chapter_markdown(html: str) -> str:
+    """Convert the content of a NICE chapter page to markdown."""
+    chapter_soup = BeautifulSoup(html, "html.parser")
+
+    markdown = ""
+
+    # Extract content from the main content div
+    content_div = chapter_soup.find("div", attrs={"data-g": "12"})
+
+    if content_div:
+        # Find the js-in-page-nav-target div
+        nav_target_div = content_div.find("div", class_="js-in-page-nav-target")
+
+        if nav_target_div:
+            # For chapters other than overview, look for the chapter div
+            chapter_div = nav_target_div.find("div", class_="chapter")
+
+            # If there's a chapter div, use it as content source, otherwise use the nav_target_div
+            content_source = chapter_div if chapter_div else nav_target_div
+
+            # Add main title if present (could be in chapter div or nav_target_div)
+            main_title = content_source.find(["h1", "h2"], class_="title")
+            if main_title:
+                markdown += f"# {main_title.text.strip()}\n\n"
+
+            # Extract all content in a hierarchical manner
+            sections = content_source.find_all(
+                ["div", "p", "h3", "h4"], recursive=False
+            )
+
+            # If no sections found at top level, check all elements
+            if not sections:
+                # Get all text with heading structure preserved
+                all_headings = content_source.find_all(
+                    ["h1", "h2", "h3", "h4", "h5", "h6"]
+                )
+                for heading in all_headings:
+                    level = int(heading.name[1])
+                    markdown_heading = "#" * level
+                    markdown += f"{markdown_heading} {heading.text.strip()}\n\n"
+
+                    # Get paragraphs and lists that follow until next heading
+                    next_el = heading.find_next_sibling()
+                    while next_el and not next_el.name.startswith("h"):
+                        if next_el.name == "p":
+                            # Extract links in paragraph and format them as markdown
+                            paragraph_text = next_el.text.strip()
+                            for link in next_el.find_all("a", href=True):
+                                link_text = link.text.strip()
+                                link_url = link["href"]
+                                if not link_url.startswith("http"):
+                                    link_url = NICE_BASE_URL + link_url
+                                # Replace the plain text with markdown link
+                                paragraph_text = paragraph_text.replace(
+                                    link_text,
+                                    f"[{link_text}]({link_url})",
+                                )
+
+                            markdown += f"{paragraph_text}\n\n"
+                        elif next_el.name in ["ul", "ol"]:
+                            for i, li in enumerate(next_el.find_all("li")):
+                                if next_el.name == "ol":
+                                    markdown += f"{i + 1}. {li.text.strip()}\n"
+                                else:
+                                    markdown += f"* {li.text.strip()}\n"
+                            markdown += "\n"
+                        next_el = next_el.find_next_sibling()
+            else:
+                # Process each section
+                for section in sections:
+                    if section.name in ["h3", "h4"]:
+                        # It's a heading
+                        level = int(section.name[1])
+                        markdown_heading = "#" * level
+                        markdown += f"{markdown_heading} {section.text.strip()}\n\n"
+                    elif section.name == "p":
+                        # It's a paragraph - convert links to markdown format
+                        paragraph_text = section.text.strip()
+                        for link in section.find_all("a", href=True):
+                            link_text = link.text.strip()
+                            link_url = link["href"]
+                            if not link_url.startswith("http"):
+                                link_url = NICE_BASE_URL + link_url
+                            # Replace the plain text with markdown link
+                            paragraph_text = paragraph_text.replace(
+                                link_text, f"[{link_text}]({link_url})"
+                            )
+
+                        markdown += f"{paragraph_text}\n\n"
+                    elif (
+                        section.name == "div"
+                        and section.get("class")
+                        and "section" in section.get("class")
+                    ):
+                        # It's a nested section with a title
+                        section_title = section.find(["h3", "h4"], class_="title")
+                        if section_title:
+                            level = int(section_title.name[1])
+                            markdown_heading = "#" * level
+                            markdown += (
+                                f"{markdown_heading} {section_title.text.strip()}\n\n"
+                            )
+
+                        # Get all paragraphs and lists in this section
+                        for element in section.find_all(["p", "ul", "ol"]):
+                            if element.name == "p":
+                                # Format links in paragraph
+                                paragraph_text = element.text.strip()
+                                for link in element.find_all("a", href=True):
+                                    link_text = link.text.strip()
+                                    link_url = link["href"]
+                                    if not link_url.startswith("http"):
+                                        link_url = NICE_BASE_URL + link_url
+                                    # Replace the plain text with markdown link
+                                    paragraph_text = paragraph_text.replace(
+                                        link_text,
+                                        f"[{link_text}]({link_url})",
+                                    )
+
+                                markdown += f"{paragraph_text}\n\n"
+                            elif element.name in ["ul", "ol"]:
+                                for i, li in enumerate(element.find_all("li")):
+                                    # Format list items with proper markdown
+                                    li_text = li.text.strip()
+                                    # Convert links in list items
+                                    for link in li.find_all("a", href=True):
+                                        link_text = link.text.strip()
+                                        link_url = link["href"]
+                                        if not link_url.startswith("http"):
+                                            link_url = NICE_BASE_URL + link_url
+                                        li_text = li_text.replace(
+                                            link_text,
+                                            f"[{link_text}]({link_url})",
+                                        )
+
+                                    if element.name == "ol":
+                                        markdown += f"{i + 1}. {li_text}\n"
+                                    else:
+                                        markdown += f"* {li_text}\n"
+                                markdown += "\n"
+        else:
+            # Fallback: just get all text from content_div with basic markdown formatting
+            all_text = content_div.get_text(separator="\n\n", strip=True)
+            markdown = all_text
+
+    # Clean up any excessive newlines
+    markdown = markdown.replace("\n\n\n", "\n\n")
+
+    return markdown
@@ -0,0 +1,69 @@
+"""
+Golden-output checks of the optimized data transformations, with optional benchmarks.
+
+Every check runs in its own process, with the source directory of the service it covers on the path:
+
+    python checks/run.py                  # all checks
+    python checks/run.py cleaning --benchmark --input chapters.json
+
+Options the runner doesn't know (e.g. --input) are passed on to the checks.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+CHECKS_DIR = Path(__file__).parent
+SRC_DIR = CHECKS_DIR.parent / "src"
+
+# Check name -> (script, service source directory)
+CHECKS = {
+    "cleaning": ("check_cleaning.py", SRC_DIR / "feature_pipeline"),
+    "extractors": ("check_extractors.py", SRC_DIR / "data_crawler"),
+}
+
+
+def run_check(name: str, extra_args: list[str]) -> bool:
+    script, service_dir = CHECKS[name]
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join(
+            [str(service_dir), str(SRC_DIR), os.environ.get("PYTHONPATH", "")]
+        ),
+    )
+
+    print(f"== {name}")
+    result = subprocess.run(
+        [sys.executable, str(CHECKS_DIR / script), *extra_args], env=env
+    )
+
+    return result.returncode == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "checks",
+        nargs="*",
+        help=f"Checks to run, among {list(CHECKS)}. Defaults to all.",
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Also time the optimized code against its reference implementation.",
+    )
+    args, extra_args = parser.parse_known_args()
+
+    unknown = set(args.checks) - CHECKS.keys()
+    if unknown:
+        parser.error(f"Unknown checks: {sorted(unknown)}")
+
+    failed = [
+        name
+        for name in args.checks or CHECKS
+        if not run_check(name, (["--benchmark"] if args.benchmark else []) + extra_args)
+    ]
+    if failed:
+        sys.exit(f"Failed checks: {', '.join(failed)}")
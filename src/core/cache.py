@@ -0,0 +1,150 @@
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import core.logger_utils as logger_utils
+
+logger = logger_utils.get_logger(__name__)
+
+
+class CacheBackend(ABC):
+    """Abstract base class for key-value caches. Keys are strings, values any picklable object."""
+
+    @abstractmethod
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Returns the cached values of the given keys. Missing keys are left out of the result."""
+        pass
+
+    @abstractmethod
+    def set_many(self, items: dict[str, Any]) -> None:
+        pass
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.get_many([key]).get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        self.set_many({key: value})
+
+
+class InMemoryLRUCache(CacheBackend):
+    """Thread-safe in-memory cache evicting the least recently used items above max_items."""
+
+    def __init__(self, max_items: int = 10_000) -> None:
+        self.max_items = max_items
+        self._items: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._items:
+                    self._items.move_to_end(key)
+                    found[key] = self._items[key]
+
+        return found
+
+    def set_many(self, items: dict[str, Any]) -> None:
+        with self._lock:
+            for key, value in items.items():
+                self._items[key] = value
+                self._items.move_to_end(key)
+
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+
+class SQLiteCache(CacheBackend):
+    """Persistent cache storing pickled values in a single SQLite table."""
+
+    def __init__(self, path: str, table: str = "cache") -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+            )
+
+        logger.info("Opened SQLite cache.", path=path, table=table)
+
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        found = {}
+        # Stay below SQLite's default limit of host parameters per statement
+        for start in range(0, len(keys), 500):
+            batch = keys[start : start + 500]
+            placeholders = ",".join("?" * len(batch))
+            with self._lock:
+                rows = self._connection.execute(
+                    f"SELECT key, value FROM {self.table} WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+            found.update((key, pickle.loads(value)) for key, value in rows)
+
+        return found
+
+    def set_many(self, items: dict[str, Any]) -> None:
+        rows = [(key, pickle.dumps(value)) for key, value in items.items()]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)", rows
+            )
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class TieredCache(CacheBackend):
+    """Reads from a fast front cache first and falls back to a slower back cache, warming the front."""
+
+    def __init__(self, front: CacheBackend, back: CacheBackend) -> None:
+        self.front = front
+        self.back = back
+
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        found = self.front.get_many(keys)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            from_back = self.back.get_many(missing)
+            if from_back:
+                self.front.set_many(from_back)
+                found.update(from_back)
+
+        return found
+
+    def set_many(self, items: dict[str, Any]) -> None:
+        self.front.set_many(items)
+        self.back.set_many(items)
+
+
+class TTLCache(CacheBackend):
+    """Expires the items of another cache ttl_seconds after they were set. Expired items are simply ignored."""
+
+    def __init__(self, backend: CacheBackend, ttl_seconds: float) -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        # Wall-clock time, since the expiry dates can be persisted
+        now = time.time()
+
+        return {
+            key: value
+            for key, (expires_at, value) in self.backend.get_many(keys).items()
+            if expires_at > now
+        }
+
+    def set_many(self, items: dict[str, Any]) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        self.backend.set_many(
+            {key: (expires_at, value) for key, value in items.items()}
+        )
@@ -26,6 +26,10 @@ class AppSettings(BaseSettings):
     QDRANT_DATABASE_PORT: int = 6333
     USE_QDRANT_CLOUD: bool = True
     QDRANT_APIKEY: str | None
+    # Use gRPC instead of REST for the point operations. The Qdrant server must expose
+    # QDRANT_GRPC_PORT (6334 by default, see the qdrant service of docker-compose.yml)
+    QDRANT_PREFER_GRPC: bool = False
+    QDRANT_GRPC_PORT: int = 6334
 
     # Embeddings config
     EMBEDDING_MODEL_PROVIDER: str = "huggingface"
@@ -38,9 +42,31 @@ class AppSettings(BaseSettings):
     SPARSE_EMBEDDING_MODEL_PROVIDER: str = "fastembed"
     SPARSE_EMBEDDING_MODEL_ID: str = "Qdrant/bm25"
 
+    # Embedding cache config
+    # none, memory or sqlite (fronted by an in-memory LRU)
+    EMBEDDING_CACHE_BACKEND: str = "none"
+    EMBEDDING_CACHE_PATH: str = str(Path(ROOT_DIR) / ".cache" / "embeddings.sqlite")
+    EMBEDDING_CACHE_MAX_ITEMS: int = 10_000
+
+    # LLM response cache of query expansion and self-query (temperature 0 calls)
+    # none, memory or sqlite (fronted by an in-memory LRU)
+    LLM_CACHE_BACKEND: str = "memory"
+    LLM_CACHE_PATH: str = str(Path(ROOT_DIR) / ".cache" / "llm.sqlite")
+    LLM_CACHE_MAX_ITEMS: int = 10_000
+    LLM_CACHE_TTL_SECONDS: float = 7 * 24 * 3600
+
     # RAG config
     ENABLE_SELF_QUERY: bool = True
     ENABLE_RERANKING: bool = True
+    # How the hits of the expanded queries are merged: rrf, score (best score) or none (dedup only)
+    RETRIEVAL_FUSION: str = "rrf"
+
+    # Reranker config
+    # llm (OpenAI chat model) or cross_encoder (local sentence-transformers model)
+    RERANKER_PROVIDER: str = "llm"
+    RERANKER_MODEL_ID: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    RERANKER_DEVICE: str = "cpu"
+    RERANKER_BATCH_SIZE: int = 32
 
     # OpenAI config
     OPENAI_MODEL_ID: str = "gpt-4o-mini"
@@ -1,8 +1,9 @@
 import uuid
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 from pydantic import UUID4, BaseModel, ConfigDict, Field
-from pymongo import errors
+from pymongo import ASCENDING, IndexModel, ReplaceOne, UpdateOne, errors
+from pymongo.results import BulkWriteResult
 
 import core.logger_utils as logger_utils
 from core.db.mongo import connection
@@ -10,6 +11,8 @@ from core.errors import ImproperlyConfiguredError
 
 _database = connection.get_database("pharmassist")
 
+DEFAULT_BATCH_SIZE = 100
+
 logger = logger_utils.get_logger(__name__)
 
 
@@ -19,12 +22,22 @@ class BaseDocument(BaseModel):
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
     @classmethod
-    def from_mongo(cls, data: dict):
-        """Convert "_id" (str object) into "id" (UUID object)."""
+    def from_mongo(cls, data: dict, partial: bool = False):
+        """
+        Convert "_id" (str object) into "id" (UUID object).
+
+        With partial=True (documents loaded with a projection) the model is built without
+        validation, so the fields left out by the projection are simply missing.
+        """
         if not data:
             return data
 
         id = data.pop("_id", None)
+        if partial:
+            return cls.model_construct(
+                **dict(data, id=uuid.UUID(id) if isinstance(id, str) else id)
+            )
+
         return cls(**dict(data, id=id))
 
     def to_mongo(self, **kwargs) -> dict:
@@ -76,12 +89,13 @@ class BaseDocument(BaseModel):
             return None
 
     @classmethod
-    def find(cls, **filter_options):
+    def find(cls, projection: Optional[dict] = None, **filter_options):
+        """First document matching the filter. With a projection, a partial document is returned."""
         collection = _database[cls._get_collection_name()]
         try:
-            instance = collection.find_one(filter_options)
+            instance = collection.find_one(filter_options, projection)
             if instance:
-                return cls.from_mongo(instance)
+                return cls.from_mongo(instance, partial=projection is not None)
 
             return None
         except errors.OperationFailure:
@@ -89,19 +103,115 @@ class BaseDocument(BaseModel):
 
             return None
 
+    @classmethod
+    def exists(cls, **filter_options) -> bool:
+        """Check for a matching document, returning only the filtered fields so an index can cover the query."""
+        collection = _database[cls._get_collection_name()]
+        projection = {"_id": 0, **{field: 1 for field in filter_options}}
+        try:
+            return collection.find_one(filter_options, projection) is not None
+        except errors.OperationFailure:
+            logger.error("Failed to check document existence")
+
+            return False
+
+    @classmethod
+    def find_many(cls, projection: Optional[dict] = None, **filter_options) -> list:
+        """All documents matching the filter. With a projection, partial documents are returned."""
+        return list(cls.iter_all(projection=projection, **filter_options))
+
+    @classmethod
+    def iter_all(
+        cls,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        projection: Optional[dict] = None,
+        **filter_options,
+    ) -> Iterator:
+        """Stream the documents matching the filter, fetching batch_size documents per round trip."""
+        collection = _database[cls._get_collection_name()]
+        try:
+            cursor = collection.find(filter_options, projection, batch_size=batch_size)
+            for instance in cursor:
+                yield cls.from_mongo(instance, partial=projection is not None)
+        except errors.OperationFailure:
+            logger.exception("Failed to retrieve documents.")
+
+    @classmethod
+    def distinct(cls, field: str, **filter_options) -> list:
+        collection = _database[cls._get_collection_name()]
+        try:
+            return collection.distinct(field, filter_options)
+        except errors.OperationFailure:
+            logger.exception("Failed to retrieve distinct values.")
+
+            return []
+
     @classmethod
     def bulk_insert(cls, documents: List, **kwargs) -> Optional[List[str]]:
         collection = _database[cls._get_collection_name()]
         try:
             result = collection.insert_many(
-                [doc.to_mongo(**kwargs) for doc in documents]
+                [doc.to_mongo(**kwargs) for doc in documents], ordered=False
             )
             return result.inserted_ids
-        except errors.WriteError:
+        except (errors.WriteError, errors.BulkWriteError):
             logger.exception("Failed to insert documents.")
 
             return None
 
+    @classmethod
+    def bulk_upsert(
+        cls, documents: List, match_fields: tuple[str, ...] = ("_id",), **kwargs
+    ) -> Optional[BulkWriteResult]:
+        """
+        Insert or update all documents in one unordered bulk write.
+
+        Documents are matched on their id by default and replaced. When matching on other fields
+        (e.g. url), the matched document keeps its id and only the other fields are updated.
+        """
+        if not documents:
+            return None
+
+        operations = []
+        for document in documents:
+            data = document.to_mongo(**kwargs)
+            match_filter = {field: data[field] for field in match_fields}
+
+            if match_fields == ("_id",):
+                operations.append(ReplaceOne(match_filter, data, upsert=True))
+            else:
+                id = data.pop("_id")
+                operations.append(
+                    UpdateOne(
+                        match_filter,
+                        {"$set": data, "$setOnInsert": {"_id": id}},
+                        upsert=True,
+                    )
+                )
+
+        collection = _database[cls._get_collection_name()]
+        try:
+            return collection.bulk_write(operations, ordered=False)
+        except errors.BulkWriteError:
+            logger.exception("Failed to upsert documents.")
+
+            return None
+
+    @classmethod
+    def ensure_indexes(cls) -> None:
+        """Create the indexes declared in Settings.indexes. Already existing indexes are left untouched."""
+        indexes = getattr(getattr(cls, "Settings", None), "indexes", [])
+        if not indexes:
+            return
+
+        collection = _database[cls._get_collection_name()]
+        try:
+            collection.create_indexes(indexes)
+        except errors.OperationFailure:
+            logger.exception(
+                "Failed to create indexes.", collection=cls._get_collection_name()
+            )
+
     @classmethod
     def _get_collection_name(cls):
         if not hasattr(cls, "Settings") or not hasattr(cls.Settings, "name"):
@@ -117,6 +227,10 @@ class NiceDocument(BaseDocument):
     url: str
     last_updated: str
     chapters: List[dict]
+    # HTTP validators of the guideline page, used for conditional re-crawls
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
 
     class Settings:
         name = "NICE_GUIDELINE"
+        indexes = [IndexModel([("url", ASCENDING)], unique=True)]
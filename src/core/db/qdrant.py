@@ -1,3 +1,7 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 from qdrant_client import QdrantClient, models
 from qdrant_client.http.models import (
     Batch,
@@ -14,22 +18,33 @@ from core.config import settings
 
 logger = logger_utils.get_logger(__name__)
 
+# Non-vector collection holding a version marker per collection, changed on every write
+COLLECTION_VERSIONS = "collection_versions"
+
+
+def get_client_kwargs() -> dict:
+    if settings.USE_QDRANT_CLOUD:
+        return {
+            "url": settings.QDRANT_CLOUD_URL,
+            "api_key": settings.QDRANT_APIKEY,
+            "prefer_grpc": settings.QDRANT_PREFER_GRPC,
+        }
+
+    return {
+        "host": settings.QDRANT_DATABASE_HOST,
+        "port": settings.QDRANT_DATABASE_PORT,
+        "grpc_port": settings.QDRANT_GRPC_PORT,
+        "prefer_grpc": settings.QDRANT_PREFER_GRPC,
+    }
+
 
 class QdrantDatabaseConnector:
+    # Shared by every connector of the process, so all of them reuse the same connection
     _instance: QdrantClient | None = None
 
     def __init__(self) -> None:
-        if self._instance is None:
-            if settings.USE_QDRANT_CLOUD:
-                self._instance = QdrantClient(
-                    url=settings.QDRANT_CLOUD_URL,
-                    api_key=settings.QDRANT_APIKEY,
-                )
-            else:
-                self._instance = QdrantClient(
-                    host=settings.QDRANT_DATABASE_HOST,
-                    port=settings.QDRANT_DATABASE_PORT,
-                )
+        if QdrantDatabaseConnector._instance is None:
+            QdrantDatabaseConnector._instance = QdrantClient(**get_client_kwargs())
 
     def get_collection(self, collection_name: str):
         return self._instance.get_collection(collection_name=collection_name)
@@ -54,6 +69,14 @@ class QdrantDatabaseConnector:
             },
         )
 
+    def create_keyword_index(self, collection_name: str, field_name: str) -> None:
+        """Create a keyword payload index on field_name. Does nothing if the index already exists."""
+        self._instance.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=models.PayloadSchemaType.KEYWORD,
+        )
+
     def write_data(self, collection_name: str, points: Batch):
         try:
             self._instance.upsert(collection_name=collection_name, points=points)
@@ -62,6 +85,89 @@ class QdrantDatabaseConnector:
 
             raise
 
+    def write_data_batched(
+        self,
+        collection_name: str,
+        ids: list,
+        vectors: dict[str, np.ndarray | list],
+        payloads: list[dict],
+        batch_size: int = 64,
+        parallelism: int = 4,
+    ) -> None:
+        """
+        Upsert points in chunks of batch_size, sent concurrently with wait=False.
+
+        The last chunk is sent with wait=True only after all the others were acknowledged. Qdrant applies
+        the updates of a collection in order, so its completion acts as a barrier for the whole batch.
+
+        Dense vectors can be given as a 2-D float32 array, which is only converted to the client's wire
+        format one chunk at a time.
+        """
+        if not ids:
+            return
+
+        chunks = [
+            slice(start, start + batch_size) for start in range(0, len(ids), batch_size)
+        ]
+
+        def upsert_chunk(chunk: slice, wait: bool) -> None:
+            self._instance.upsert(
+                collection_name=collection_name,
+                points=Batch(
+                    ids=ids[chunk],
+                    vectors={
+                        name: to_vector_batch(values[chunk])
+                        for name, values in vectors.items()
+                    },
+                    payloads=payloads[chunk],
+                ),
+                wait=wait,
+            )
+
+        try:
+            if len(chunks) > 1:
+                with ThreadPoolExecutor(max_workers=parallelism) as executor:
+                    list(
+                        executor.map(
+                            lambda chunk: upsert_chunk(chunk, False), chunks[:-1]
+                        )
+                    )
+            upsert_chunk(chunks[-1], True)
+        except Exception:
+            logger.exception("An error occurred while inserting data.")
+
+            raise
+
+    def delete_by_filter(
+        self, collection_name: str, points_filter: models.Filter, wait: bool = True
+    ) -> None:
+        self._instance.delete(
+            collection_name=collection_name,
+            points_selector=models.FilterSelector(filter=points_filter),
+            wait=wait,
+        )
+
+    def delete_points(self, collection_name: str, ids: list, wait: bool = True) -> None:
+        self._instance.delete(
+            collection_name=collection_name,
+            points_selector=models.PointIdsList(points=ids),
+            wait=wait,
+        )
+
+    def set_payload(
+        self,
+        collection_name: str,
+        payload: dict,
+        points_filter: models.Filter,
+        wait: bool = True,
+    ) -> None:
+        self._instance.set_payload(
+            collection_name=collection_name,
+            payload=payload,
+            points=models.FilterSelector(filter=points_filter),
+            wait=wait,
+        )
+
     def search(
         self,
         collection_name: str,
@@ -71,58 +177,62 @@ class QdrantDatabaseConnector:
     ) -> list:
         return self._instance.query_points(
             collection_name=collection_name,
-            query=query_vector,
+            query=to_query_vector(query_vector),
             query_filter=query_filter,
             limit=limit,
         ).points
 
-    def hybrid_search_rrf(
+    def hybrid_search_rrf_batch(
         self,
         collection_name: str,
-        dense_vector: list[float],
-        sparse_vector: dict,
+        dense_vectors: list,
+        sparse_vectors: list[dict | None],
         query_filter: models.Filter | None = None,
         limit: int = 3,
-    ) -> list:
+    ) -> list[list]:
         """
-        Perform hybrid search using both dense and sparse vectors with Reciprocal Rank Fusion (RRF).
+        Hybrid RRF search of several queries in a single query_batch_points request.
 
-        Args:
-            collection_name: Name of the collection to search
-            dense_vector: Dense embedding vector
-            sparse_vector: Sparse vector (e.g., from BM25)
-            query_filter: Optional filter to apply
-            limit: Maximum number of results to return
-
-        Returns:
-            List of search results
+        Returns the results of every query, in the order of the given vectors.
         """
-        # Create prefetch queries for each vector type
-        prefetch_queries = [
-            Prefetch(
-                query=dense_vector,
-                using="dense",
-                limit=limit,
-            )
-        ]
+        responses = self._instance.query_batch_points(
+            collection_name=collection_name,
+            requests=build_hybrid_query_requests(
+                dense_vectors, sparse_vectors, query_filter, limit
+            ),
+        )
+
+        return [response.points for response in responses]
 
-        # Add sparse vector prefetch if provided
-        if sparse_vector:
-            prefetch_queries.append(
-                Prefetch(
-                    query=sparse_vector,
-                    using="sparse",
-                    limit=limit,
+    def set_collection_version(self, collection_name: str) -> str:
+        """Record that collection_name changed, so readers caching its results can drop them."""
+        version = uuid.uuid4().hex
+        self._instance.upsert(
+            collection_name=COLLECTION_VERSIONS,
+            points=[
+                models.PointStruct(
+                    id=get_version_point_id(collection_name),
+                    vector={},
+                    payload={"collection": collection_name, "version": version},
                 )
-            )
+            ],
+            wait=False,
+        )
 
-        return self._instance.query_points(
-            collection_name=collection_name,
-            prefetch=prefetch_queries,
-            query=models.FusionQuery(fusion=Fusion.RRF),
-            query_filter=query_filter,
-            limit=limit,
-        ).points
+        return version
+
+    def get_collection_version(self, collection_name: str) -> str | None:
+        """Version marker of collection_name. None if it was never written, or no collection was ever versioned."""
+        if not self._instance.collection_exists(COLLECTION_VERSIONS):
+            return None
+
+        points = self._instance.retrieve(
+            collection_name=COLLECTION_VERSIONS,
+            ids=[get_version_point_id(collection_name)],
+            with_payload=True,
+        )
+
+        return points[0].payload["version"] if points else None
 
     def scroll(
         self,
@@ -134,8 +244,111 @@ class QdrantDatabaseConnector:
             collection_name=collection_name, limit=limit, scroll_filter=scroll_filter
         )
 
+    def scroll_all(
+        self,
+        collection_name: str,
+        scroll_filter: models.Filter | None = None,
+        with_payload: bool | list[str] = False,
+        batch_size: int = 1000,
+    ):
+        """Yield every point matching scroll_filter, following the scroll pages. Vectors are never loaded."""
+        offset = None
+        while True:
+            points, offset = self._instance.scroll(
+                collection_name=collection_name,
+                scroll_filter=scroll_filter,
+                limit=batch_size,
+                offset=offset,
+                with_payload=with_payload,
+                with_vectors=False,
+            )
+            yield from points
+
+            if offset is None:
+                break
+
     def close(self):
-        if self._instance:
-            self._instance.close()
+        if QdrantDatabaseConnector._instance:
+            QdrantDatabaseConnector._instance.close()
+            QdrantDatabaseConnector._instance = None
 
             logger.info("Connected to database has been closed.")
+
+
+def build_hybrid_query(
+    dense_vector: np.ndarray | list[float],
+    sparse_vector: dict | None,
+    limit: int,
+) -> dict:
+    """Arguments of a hybrid query: dense and sparse prefetches fused with Reciprocal Rank Fusion (RRF)."""
+    # Create prefetch queries for each vector type
+    prefetch_queries = [
+        Prefetch(
+            query=to_query_vector(dense_vector),
+            using="dense",
+            limit=limit,
+        )
+    ]
+
+    # Add sparse vector prefetch if provided
+    if sparse_vector:
+        prefetch_queries.append(
+            Prefetch(
+                query=to_sparse_vector(sparse_vector),
+                using="sparse",
+                limit=limit,
+            )
+        )
+
+    return {
+        "prefetch": prefetch_queries,
+        "query": models.FusionQuery(fusion=Fusion.RRF),
+        "limit": limit,
+    }
+
+
+def build_hybrid_query_requests(
+    dense_vectors: list,
+    sparse_vectors: list[dict | None],
+    query_filter: models.Filter | None,
+    limit: int,
+) -> list[models.QueryRequest]:
+    return [
+        models.QueryRequest(
+            **build_hybrid_query(dense_vector, sparse_vector, limit),
+            filter=query_filter,
+            with_payload=True,
+        )
+        for dense_vector, sparse_vector in zip(dense_vectors, sparse_vectors)
+    ]
+
+
+def get_version_point_id(collection_name: str) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, collection_name))
+
+
+def to_query_vector(vector: np.ndarray | list[float]) -> list[float]:
+    if isinstance(vector, np.ndarray):
+        return vector.tolist()
+
+    return vector
+
+
+def to_sparse_vector(sparse_vector: dict) -> models.SparseVector:
+    """Convert a sparse embedding object ({"indices": ..., "values": ...}, possibly numpy arrays)."""
+    return models.SparseVector(
+        indices=np.asarray(sparse_vector["indices"]).tolist(),
+        values=np.asarray(sparse_vector["values"]).tolist(),
+    )
+
+
+def to_vector_batch(vectors: np.ndarray | list) -> list:
+    if isinstance(vectors, np.ndarray):
+        return vectors.tolist()
+
+    return [
+        to_sparse_vector(vector)
+        if isinstance(vector, dict)
+        else to_query_vector(vector)
+        for vector in vectors
+    ]
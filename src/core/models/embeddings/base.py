@@ -1,14 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import List, Union
+from typing import Any, List, Union
+
+import numpy as np
 
 
 class EmbeddingModel(ABC):
     """Abstract base class for all embedding models."""
 
     @abstractmethod
-    def embed(
-        self, texts: Union[str, List[str]]
-    ) -> Union[List[float], List[List[float]]]:
+    def embed(self, texts: Union[str, List[str]]) -> Union[np.ndarray, Any]:
         """
         Generates embeddings for the given text(s).
 
@@ -16,8 +16,9 @@ class EmbeddingModel(ABC):
             texts: A single string or a list of strings to embed.
 
         Returns:
-            A list of embeddings, where each embedding is a list of floats.
-            If a single string was input, returns a list containing one embedding.
+            Dense models return float32 arrays: a 1-D array for a single string and
+            a 2-D array, with one row per text, for a list of strings.
+            Sparse models return one sparse embedding per text.
         """
         pass
 
@@ -0,0 +1,93 @@
+import hashlib
+from typing import Any, List, Union
+
+import numpy as np
+
+from core.cache import CacheBackend, InMemoryLRUCache, SQLiteCache, TieredCache
+from core.logger_utils import get_logger
+from core.models.embeddings.base import EmbeddingModel
+
+logger = get_logger(__name__)
+
+
+class CachedEmbeddingModel(EmbeddingModel):
+    """
+    Wraps any embedding model with a content-addressed cache.
+
+    Embeddings are keyed by (model id, dense/sparse, text hash), so only texts that were never embedded
+    by the same model reach the wrapped model, in a single call.
+    """
+
+    def __init__(
+        self, model: EmbeddingModel, cache: CacheBackend, sparse: bool = False
+    ):
+        """
+        Initializes the cached embedding model.
+
+        Args:
+            model: The embedding model to wrap.
+            cache: The cache backend storing the embeddings.
+            sparse: Whether the wrapped model generates sparse embeddings.
+        """
+        self.model = model
+        self.cache = cache
+        self.sparse = sparse
+        self.model_name = getattr(model, "model_name", type(model).__name__)
+        self._key_prefix = f"{'sparse' if sparse else 'dense'}\0{self.model_name}\0"
+
+    def _cache_key(self, text: str) -> str:
+        return hashlib.sha256((self._key_prefix + text).encode()).hexdigest()
+
+    def embed(self, texts: Union[str, List[str]]) -> Union[Any, List[Any]]:
+        """Returns the cached embeddings, computing the missing ones with the wrapped model."""
+        single_input = isinstance(texts, str)
+        texts = [texts] if single_input else list(texts)
+
+        keys = [self._cache_key(text) for text in texts]
+        embeddings = self.cache.get_many(list(dict.fromkeys(keys)))
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in embeddings}
+        if missing:
+            computed = dict(zip(missing, self.model.embed(list(missing.values()))))
+            if not self.sparse:
+                # Copy the rows, so cached vectors don't keep the whole batch array alive
+                computed = {key: np.array(row) for key, row in computed.items()}
+            self.cache.set_many(computed)
+            embeddings.update(computed)
+
+        logger.debug(
+            "Embedding cache lookup.",
+            model_name=self.model_name,
+            num_texts=len(texts),
+            num_misses=len(missing),
+        )
+
+        if single_input:
+            return embeddings[keys[0]]
+        if self.sparse:
+            return [embeddings[key] for key in keys]
+
+        return np.stack([embeddings[key] for key in keys])
+
+    @classmethod
+    def from_settings(cls, settings, model: EmbeddingModel, sparse: bool = False):
+        """Wraps model with the cache backend configured in the global settings object."""
+        backend = settings.EMBEDDING_CACHE_BACKEND.lower()
+        memory_cache = InMemoryLRUCache(max_items=settings.EMBEDDING_CACHE_MAX_ITEMS)
+
+        if backend == "memory":
+            cache = memory_cache
+        elif backend == "sqlite":
+            cache = TieredCache(
+                front=memory_cache,
+                back=SQLiteCache(
+                    path=settings.EMBEDDING_CACHE_PATH, table="embeddings"
+                ),
+            )
+        else:
+            raise ValueError(
+                f"Unknown embedding cache backend: '{backend}'. "
+                "Available: ['none', 'memory', 'sqlite']"
+            )
+
+        return cls(model=model, cache=cache, sparse=sparse)
@@ -2,6 +2,7 @@ from typing import Dict, Type
 
 from core.config import settings
 from core.models.embeddings.base import EmbeddingModel
+from core.models.embeddings.cached import CachedEmbeddingModel
 from core.models.embeddings.fastembed import SparseEmbeddingModel
 from core.models.embeddings.hf import HuggingFaceEmbeddingModel
 from core.models.embeddings.openai import OpenAIEmbeddingModel
@@ -34,6 +35,7 @@ class EmbeddingModelFactory:
 
         Returns:
             An instance of the requested EmbeddingModel or None (only for sparse embeddings).
+            The model is wrapped in a CachedEmbeddingModel if an embedding cache is configured.
         """
         provider = (
             self.settings.EMBEDDING_MODEL_PROVIDER
@@ -54,7 +56,7 @@ class EmbeddingModelFactory:
         model_cls = _EMBEDDING_MODEL_REGISTRY[provider_lower]
         try:
             # Use the classmethod with the potentially overridden settings
-            return model_cls.from_settings(self.settings)
+            model = model_cls.from_settings(self.settings)
         except AttributeError as e:
             raise AttributeError(
                 f"Missing required setting for provider '{provider}': {e}"
@@ -64,6 +66,13 @@ class EmbeddingModelFactory:
                 f"Error creating embedding model for provider '{provider}': {e}"
             ) from e
 
+        if getattr(self.settings, "EMBEDDING_CACHE_BACKEND", "none").lower() == "none":
+            return model
+
+        return CachedEmbeddingModel.from_settings(
+            self.settings, model=model, sparse=sparse
+        )
+
 
 # Global instance of the factory using the default global settings
 embedding_model_factory = EmbeddingModelFactory()
@@ -1,5 +1,6 @@
 from typing import List, Optional, Union
 
+import numpy as np
 import torch
 from sentence_transformers import SentenceTransformer
 
@@ -34,12 +35,12 @@ class HuggingFaceEmbeddingModel(EmbeddingModel):
         self.model = SentenceTransformer(model_name, device=device)
         logger.info(f"Initialized HuggingFaceEmbeddingModel with model '{model_name}'")
 
-    def embed(
-        self, texts: Union[str, List[str]]
-    ) -> Union[List[float], List[List[float]]]:
-        """Generates embeddings using the loaded sentence-transformer model."""
+    def embed(self, texts: Union[str, List[str]]) -> np.ndarray:
+        """Generates float32 embeddings using the loaded sentence-transformer model."""
 
-        return self.model.encode(texts).tolist()
+        return self.model.encode(texts, convert_to_numpy=True).astype(
+            np.float32, copy=False
+        )
 
     @classmethod
     def from_settings(cls, settings):
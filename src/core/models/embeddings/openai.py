@@ -1,5 +1,6 @@
 from typing import List, Union
 
+import numpy as np
 from langchain_openai import OpenAIEmbeddings
 
 from core.logger_utils import get_logger
@@ -22,11 +23,12 @@ class OpenAIEmbeddingModel(EmbeddingModel):
         self.model = OpenAIEmbeddings(model=model_name)
         logger.info(f"Initialized OpenAIEmbeddingModel with model '{model_name}'")
 
-    def embed(
-        self, texts: Union[str, List[str]]
-    ) -> Union[List[float], List[List[float]]]:
-        """Generates embeddings using the OpenAI API."""
-        return self.model.embed_documents(texts)
+    def embed(self, texts: Union[str, List[str]]) -> np.ndarray:
+        """Generates float32 embeddings using the OpenAI API."""
+        if isinstance(texts, str):
+            return np.asarray(self.model.embed_query(texts), dtype=np.float32)
+
+        return np.asarray(self.model.embed_documents(texts), dtype=np.float32)
 
     @classmethod
     def from_settings(cls, settings):
@@ -1,3 +1,5 @@
+import threading
+import time
 from typing import Self
 
 import pika
@@ -8,6 +10,29 @@ from core.logger_utils import get_logger
 logger = get_logger(__file__)
 
 
+def create_connection(
+    host: str | None = None,
+    port: int | None = None,
+    username: str | None = None,
+    password: str | None = None,
+    virtual_host: str = "/",
+) -> pika.BlockingConnection:
+    """Open a new, non-shared blocking connection to RabbitMQ."""
+    credentials = pika.PlainCredentials(
+        username or settings.RABBITMQ_DEFAULT_USERNAME,
+        password or settings.RABBITMQ_DEFAULT_PASSWORD,
+    )
+
+    return pika.BlockingConnection(
+        pika.ConnectionParameters(
+            host=host or settings.RABBITMQ_HOST,
+            port=port or settings.RABBITMQ_PORT,
+            virtual_host=virtual_host,
+            credentials=credentials,
+        )
+    )
+
+
 class RabbitMQConnection:
     """Singleton class to manage RabbitMQ connection."""
 
@@ -46,14 +71,12 @@ class RabbitMQConnection:
 
     def connect(self):
         try:
-            credentials = pika.PlainCredentials(self.username, self.password)
-            self._connection = pika.BlockingConnection(
-                pika.ConnectionParameters(
-                    host=self.host,
-                    port=self.port,
-                    virtual_host=self.virtual_host,
-                    credentials=credentials,
-                )
+            self._connection = create_connection(
+                host=self.host,
+                port=self.port,
+                username=self.username,
+                password=self.password,
+                virtual_host=self.virtual_host,
             )
         except pika.exceptions.AMQPConnectionError as e:
             logger.exception("Failed to connect to RabbitMQ:")
@@ -74,31 +97,144 @@ class RabbitMQConnection:
             print("Closed RabbitMQ connection")
 
 
-def publish_to_rabbitmq(queue_name: str, data: str):
-    """Publish data to a RabbitMQ queue."""
-    try:
-        # Create an instance of RabbitMQConnection
-        rabbitmq_conn = RabbitMQConnection()
+class RabbitMQPublisher:
+    """
+    Long-lived publisher that reuses one connection and channel across publishes.
+
+    Queues are declared once per connection. A batch of messages is published inside a single
+    AMQP transaction, so the broker confirms the whole batch in one round trip instead of one
+    blocking confirm per message. Lost connections are reopened and the batch is retried.
+    """
+
+    RECOVERABLE_ERRORS = (
+        pika.exceptions.AMQPConnectionError,
+        pika.exceptions.AMQPChannelError,
+        pika.exceptions.StreamLostError,
+    )
+
+    def __init__(
+        self,
+        host: str | None = None,
+        port: int | None = None,
+        username: str | None = None,
+        password: str | None = None,
+        virtual_host: str = "/",
+        max_retries: int = 3,
+        retry_delay_seconds: float = 1.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.virtual_host = virtual_host
+        self.max_retries = max_retries
+        self.retry_delay_seconds = retry_delay_seconds
+
+        self._connection = None
+        self._channel = None
+        self._declared_queues = set()
+        # pika connections are not thread-safe
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def publish(self, queue_name: str, data: str) -> None:
+        self.publish_batch(queue_name=queue_name, messages=[data])
+
+    def publish_batch(self, queue_name: str, messages: list[str]) -> None:
+        """Publish all messages to the queue, returning once the broker has committed them."""
+        if not messages:
+            return
+
+        with self._lock:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    channel = self._get_channel()
+                    self._declare_queue(channel, queue_name)
+
+                    for data in messages:
+                        channel.basic_publish(
+                            exchange="",
+                            routing_key=queue_name,
+                            body=data,
+                            properties=pika.BasicProperties(
+                                delivery_mode=2,  # make message persistent
+                            ),
+                        )
+                    channel.tx_commit()
+
+                    return
+                except self.RECOVERABLE_ERRORS:
+                    # The uncommitted transaction is discarded by the broker, so the batch is safe to resend
+                    self._reset()
+                    if attempt == self.max_retries:
+                        raise
+
+                    logger.warning(
+                        "Lost RabbitMQ connection while publishing. Reconnecting...",
+                        attempt=attempt + 1,
+                        queue_name=queue_name,
+                    )
+                    time.sleep(self.retry_delay_seconds)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None and self._connection.is_open:
+                self._connection.close()
+
+            self._reset()
+
+    def _get_channel(self):
+        if self._channel is None or not self._channel.is_open:
+            if self._connection is None or not self._connection.is_open:
+                self._connection = create_connection(
+                    host=self.host,
+                    port=self.port,
+                    username=self.username,
+                    password=self.password,
+                    virtual_host=self.virtual_host,
+                )
+                self._declared_queues.clear()
+
+            self._channel = self._connection.channel()
+            self._channel.tx_select()
 
-        # Establish connection
-        with rabbitmq_conn:
-            channel = rabbitmq_conn.get_channel()
+        return self._channel
 
-            # Ensure the queue exists
+    def _declare_queue(self, channel, queue_name: str) -> None:
+        if queue_name not in self._declared_queues:
             channel.queue_declare(queue=queue_name, durable=True)
+            self._declared_queues.add(queue_name)
 
-            # Delivery confirmation
-            channel.confirm_delivery()
-
-            # Send data to the queue
-            channel.basic_publish(
-                exchange="",
-                routing_key=queue_name,
-                body=data,
-                properties=pika.BasicProperties(
-                    delivery_mode=2,  # make message persistent
-                ),
-            )
+    def _reset(self) -> None:
+        self._connection = None
+        self._channel = None
+        self._declared_queues.clear()
+
+
+_publisher: RabbitMQPublisher | None = None
+_publisher_lock = threading.Lock()
+
+
+def get_publisher() -> RabbitMQPublisher:
+    """Process-wide publisher shared by publish_to_rabbitmq."""
+    global _publisher
+
+    with _publisher_lock:
+        if _publisher is None:
+            _publisher = RabbitMQPublisher()
+
+    return _publisher
+
+
+def publish_to_rabbitmq(queue_name: str, data: str):
+    """Publish data to a RabbitMQ queue."""
+    try:
+        get_publisher().publish(queue_name=queue_name, data=data)
     except pika.exceptions.UnroutableError:
         logger.warning("Message could not be routed")
     except Exception:
@@ -0,0 +1,79 @@
+from typing import Callable
+
+# Rank constant of Reciprocal Rank Fusion, as in the original paper and Qdrant's fusion
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(result_lists: list[list], k: int = RRF_K) -> list:
+    """
+    Merge the hits of several queries with Reciprocal Rank Fusion.
+
+    Every point scores sum(1 / (k + rank)) over the lists it appears in. Each point is kept once,
+    as first seen, and ties are broken by the position of its first appearance.
+    """
+    return _fuse(
+        result_lists,
+        lambda rank, _, fused_score: (fused_score or 0.0) + 1.0 / (k + rank + 1),
+    )
+
+
+def score_fusion(result_lists: list[list]) -> list:
+    """Merge the hits of several queries, keeping each point once with its best score."""
+    return _fuse(
+        result_lists,
+        lambda _, score, fused_score: (
+            score if fused_score is None else max(score, fused_score)
+        ),
+    )
+
+
+def deduplicate(result_lists: list[list]) -> list:
+    """Merge the hits of several queries by rank, then query order, keeping the first occurrence of each point."""
+    return _fuse(result_lists, lambda *_: 0.0)
+
+
+FUSION_METHODS: dict[str, Callable[[list[list]], list]] = {
+    "rrf": reciprocal_rank_fusion,
+    "score": score_fusion,
+    "none": deduplicate,
+}
+
+
+def fuse_results(result_lists: list[list], method: str = "rrf") -> list:
+    """Merge and deduplicate the hits of several queries with the given fusion method."""
+    fusion = FUSION_METHODS.get(method.lower())
+    if fusion is None:
+        raise ValueError(
+            f"Unknown fusion method: '{method}'. Available: {list(FUSION_METHODS)}"
+        )
+
+    return fusion(result_lists)
+
+
+def _fuse(
+    result_lists: list[list],
+    update_score: Callable[[int, float, float | None], float],
+) -> list:
+    """Deduplicate the hits by point id and sort them by fused score, then by first appearance (rank, query)."""
+    points = {}
+    fused_scores = {}
+    first_seen = {}
+
+    for query_index, hits in enumerate(result_lists):
+        for rank, hit in enumerate(hits):
+            point_id = str(hit.id)
+            if point_id not in points:
+                points[point_id] = hit
+                fused_scores[point_id] = None
+                first_seen[point_id] = (rank, query_index)
+
+            fused_scores[point_id] = update_score(
+                rank, hit.score, fused_scores[point_id]
+            )
+
+    ranked_ids = sorted(
+        points,
+        key=lambda point_id: (-fused_scores[point_id], first_seen[point_id]),
+    )
+
+    return [points[point_id] for point_id in ranked_ids]
@@ -0,0 +1,85 @@
+import hashlib
+import json
+from functools import lru_cache
+from typing import Any, Callable
+
+from langchain_openai import ChatOpenAI
+
+import core.logger_utils as logger_utils
+from core.cache import (
+    CacheBackend,
+    InMemoryLRUCache,
+    SQLiteCache,
+    TieredCache,
+    TTLCache,
+)
+from core.config import settings
+
+logger = logger_utils.get_logger(__name__)
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=None)
+def get_chat_model(temperature: float = 0) -> ChatOpenAI:
+    """Chat model shared by all the callers using the same temperature, so they reuse its HTTP connections."""
+    return ChatOpenAI(
+        model=settings.OPENAI_MODEL_ID,
+        api_key=settings.OPENAI_API_KEY,
+        temperature=temperature,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_llm_cache() -> CacheBackend | None:
+    """Cache of the deterministic LLM calls configured by LLM_CACHE_BACKEND. None if disabled."""
+    backend = settings.LLM_CACHE_BACKEND.lower()
+    if backend == "none":
+        return None
+
+    memory_cache = InMemoryLRUCache(max_items=settings.LLM_CACHE_MAX_ITEMS)
+    if backend == "memory":
+        cache = memory_cache
+    elif backend == "sqlite":
+        cache = TieredCache(
+            front=memory_cache,
+            back=SQLiteCache(path=settings.LLM_CACHE_PATH, table="llm_responses"),
+        )
+    else:
+        raise ValueError(
+            f"Unknown LLM cache backend: '{backend}'. "
+            "Available: ['none', 'memory', 'sqlite']"
+        )
+
+    return TTLCache(cache, ttl_seconds=settings.LLM_CACHE_TTL_SECONDS)
+
+
+def build_cache_key(model: str, prompt: str, inputs: dict) -> str:
+    """
+    Key of an LLM call made with temperature 0.
+
+    The prompt text is hashed into a prompt version, so editing a template never serves answers of the old one.
+    """
+    prompt_version = hashlib.sha256(prompt.encode()).hexdigest()
+    key = json.dumps([model, prompt_version, inputs], sort_keys=True)
+
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def memoize(model: str, prompt: str, inputs: dict, generate: Callable[[], Any]) -> Any:
+    """Returns the cached result of the call, running generate() only on a cache miss."""
+    cache = get_llm_cache()
+    if cache is None:
+        return generate()
+
+    key = build_cache_key(model, prompt, inputs)
+    result = cache.get(key, _MISSING)
+    if result is not _MISSING:
+        logger.debug("LLM cache hit.", model=model, inputs=inputs)
+
+        return result
+
+    result = generate()
+    cache.set(key, result)
+
+    return result
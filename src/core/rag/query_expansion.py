@@ -1,8 +1,10 @@
+from functools import lru_cache
+
 import opik
-from langchain_openai import ChatOpenAI
 from opik.integrations.langchain import OpikTracer
 
 from core.config import settings
+from core.rag.llm_cache import get_chat_model, memoize
 from core.rag.prompt_templates import QueryExpansionTemplate
 
 
@@ -13,21 +15,33 @@ class QueryExpansion:
     @opik.track(name="QueryExpansion.generate_response")
     def generate_response(query: str, to_expand_to_n: int) -> list[str]:
         query_expansion_template = QueryExpansionTemplate()
-        prompt = query_expansion_template.create_template(to_expand_to_n)
-        model = ChatOpenAI(
+        chain = get_chain(to_expand_to_n)
+
+        def expand() -> list[str]:
+            response = chain.invoke({"question": query})
+            response = response.content
+
+            queries = response.strip().split(query_expansion_template.separator)
+            stripped_queries = [
+                stripped_item
+                for item in queries
+                if (stripped_item := item.strip(" \\n"))
+            ]
+
+            return stripped_queries
+
+        return memoize(
             model=settings.OPENAI_MODEL_ID,
-            api_key=settings.OPENAI_API_KEY,
-            temperature=0,
+            prompt=query_expansion_template.prompt,
+            inputs={"question": query, "to_expand_to_n": to_expand_to_n},
+            generate=expand,
         )
-        chain = prompt | model
-        chain = chain.with_config({"callbacks": [QueryExpansion.opik_tracer]})
 
-        response = chain.invoke({"question": query})
-        response = response.content
 
-        queries = response.strip().split(query_expansion_template.separator)
-        stripped_queries = [
-            stripped_item for item in queries if (stripped_item := item.strip(" \\n"))
-        ]
+@lru_cache(maxsize=None)
+def get_chain(to_expand_to_n: int):
+    """Built once per expansion count and reused across calls."""
+    prompt = QueryExpansionTemplate().create_template(to_expand_to_n)
+    chain = prompt | get_chat_model(temperature=0)
 
-        return stripped_queries
+    return chain.with_config({"callbacks": [QueryExpansion.opik_tracer]})
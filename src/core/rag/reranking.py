@@ -1,13 +1,39 @@
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, Type
+
+import numpy as np
 from langchain_openai import ChatOpenAI
 
+import core.logger_utils as logger_utils
 from core.config import settings
 from core.rag.prompt_templates import RerankingTemplate
 
+logger = logger_utils.get_logger(__name__)
+
+
+class Reranker(ABC):
+    """Abstract base class for passage rerankers."""
+
+    @abstractmethod
+    def generate_response(
+        self, query: str, passages: list[str], keep_top_k: int
+    ) -> list[str]:
+        """Returns the keep_top_k passages most relevant to the query, most relevant first."""
+        pass
+
+    @classmethod
+    @abstractmethod
+    def from_settings(cls, settings):
+        """Factory method to create an instance from the global settings object."""
+        pass
+
+
+class LLMReranker(Reranker):
+    """Asks the OpenAI chat model to rerank the passages. The returned passages are the model's output."""
 
-class Reranker:
-    @staticmethod
     def generate_response(
-        query: str, passages: list[str], keep_top_k: int
+        self, query: str, passages: list[str], keep_top_k: int
     ) -> list[str]:
         reranking_template = RerankingTemplate()
         prompt = reranking_template.create_template(keep_top_k=keep_top_k)
@@ -31,3 +57,73 @@ class Reranker:
         ]
 
         return stripped_passages
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls()
+
+
+class CrossEncoderReranker(Reranker):
+    """Scores (query, passage) pairs with a local cross-encoder and returns the original passages by score."""
+
+    def __init__(
+        self, model_name: str, device: str = "cpu", batch_size: int = 32
+    ) -> None:
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.model = load_cross_encoder(model_name, device)
+
+    def generate_response(
+        self, query: str, passages: list[str], keep_top_k: int
+    ) -> list[str]:
+        passages = [passage for passage in passages if passage.strip()]
+        if not passages:
+            return []
+
+        scores = self.model.predict(
+            [(query, passage) for passage in passages],
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        # Stable sort, so equally scored passages keep the retrieval order
+        ranking = np.argsort(-np.asarray(scores), kind="stable")
+
+        return [passages[index] for index in ranking[:keep_top_k]]
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(
+            model_name=settings.RERANKER_MODEL_ID,
+            device=settings.RERANKER_DEVICE,
+            batch_size=settings.RERANKER_BATCH_SIZE,
+        )
+
+
+@lru_cache(maxsize=None)
+def load_cross_encoder(model_name: str, device: str):
+    """Loaded once per process and shared by all the rerankers."""
+    from sentence_transformers import CrossEncoder
+
+    logger.info("Loading cross-encoder reranker.", model_name=model_name, device=device)
+
+    return CrossEncoder(model_name, device=device)
+
+
+# Registry of available rerankers
+_RERANKER_REGISTRY: Dict[str, Type[Reranker]] = {
+    "llm": LLMReranker,
+    "cross_encoder": CrossEncoderReranker,
+}
+
+
+def create_reranker(settings=settings) -> Reranker:
+    """Creates the reranker selected by RERANKER_PROVIDER."""
+    provider = settings.RERANKER_PROVIDER.lower()
+    if provider not in _RERANKER_REGISTRY:
+        raise ValueError(
+            f"Unknown reranker provider: '{settings.RERANKER_PROVIDER}'. "
+            f"Available: {list(_RERANKER_REGISTRY.keys())}"
+        )
+
+    return _RERANKER_REGISTRY[provider].from_settings(settings)
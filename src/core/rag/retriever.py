@@ -1,16 +1,14 @@
-import concurrent.futures
-
 import opik
 import torch
 from qdrant_client import models
 
 import core.logger_utils as logger_utils
-from core import lib
 from core.config import settings
 from core.db.qdrant import QdrantDatabaseConnector
 from core.models.embeddings import embedding_model_factory
+from core.rag.fusion import fuse_results
 from core.rag.query_expansion import QueryExpansion
-from core.rag.reranking import Reranker
+from core.rag.reranking import create_reranker
 from core.rag.self_query import SelfQuery
 
 logger = logger_utils.get_logger(__name__)
@@ -46,7 +44,7 @@ class VectorRetriever:
         self._query_expander = QueryExpansion() if n_query_expansion > 0 else None
         self.n_query_expansion = n_query_expansion
         self._metadata_extractor = SelfQuery() if self_query else None
-        self._reranker = Reranker() if rerank else None
+        self._reranker = create_reranker() if rerank else None
 
         logger.info(
             "Retriever initialized successfully.",
@@ -56,43 +54,41 @@ class VectorRetriever:
             rerank=rerank,
         )
 
-    def _search_single_query(self, generated_query: str, chapter_name: str, k: int):
-        assert k > 1, "k should be greater than 1"
-
-        dense_query_vector = self._dense_embedder.embed(generated_query)
-        sparse_query_vector = (
-            self._sparse_embedder.embed(generated_query).as_object()
+    def embed_query(self, query: str):
+        """Dense embedding of the query, as used for the search."""
+        return self._dense_embedder.embed(query)
+
+    def _embed_queries(
+        self, generated_queries: list[str], query_vector=None
+    ) -> tuple[list, list]:
+        """
+        Embed all the queries in one batch per embedder.
+
+        query_vector is the dense embedding of the first query when it was already computed, e.g. for
+        the semantic cache lookup. Only the other queries are then sent to the dense embedder.
+        """
+        if query_vector is None:
+            dense_query_vectors = list(self._dense_embedder.embed(generated_queries))
+        else:
+            dense_query_vectors = [query_vector]
+            if len(generated_queries) > 1:
+                dense_query_vectors.extend(
+                    self._dense_embedder.embed(generated_queries[1:])
+                )
+        sparse_query_vectors = (
+            [
+                embedding.as_object()
+                for embedding in self._sparse_embedder.embed(generated_queries)
+            ]
             if self._sparse_embedder
-            else None
+            else [None] * len(generated_queries)
         )
 
-        vectors = [
-            self._client.hybrid_search_rrf(
-                collection_name="vector_nice",
-                query_filter=models.Filter(
-                    must=(
-                        [
-                            models.FieldCondition(
-                                key="chapter",
-                                match=models.MatchValue(
-                                    value=chapter_name,
-                                ),
-                            )
-                        ]
-                        if chapter_name
-                        else None
-                    )
-                ),
-                dense_vector=dense_query_vector,
-                sparse_vector=sparse_query_vector,
-                limit=k,
-            )
-        ]
-
-        return lib.flatten(vectors)
+        return dense_query_vectors, sparse_query_vectors
 
     @opik.track(name="retriever.retrieve_top_k")
-    def retrieve_top_k(self, query: str, k: int) -> list:
+    def retrieve_top_k(self, query: str, k: int, query_vector=None) -> list:
+        """Top k hits of the query and its expansions. query_vector is the dense embedding of the query, if known."""
         generated_queries = [query]
 
         # query expansion
@@ -119,16 +115,35 @@ class VectorRetriever:
             else:
                 logger.warning("Did not found any chapter name in the user's prompt.")
 
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            search_tasks = [
-                executor.submit(self._search_single_query, query, chapter_name, k)
-                for query in generated_queries
-            ]
+        assert k > 1, "k should be greater than 1"
 
-            hits = [
-                task.result() for task in concurrent.futures.as_completed(search_tasks)
-            ]
-            hits = lib.flatten(hits)
+        dense_query_vectors, sparse_query_vectors = self._embed_queries(
+            generated_queries, query_vector=query_vector
+        )
+
+        # All the generated queries are searched in a single request
+        hits = self._client.hybrid_search_rrf_batch(
+            collection_name="vector_nice",
+            query_filter=models.Filter(
+                must=(
+                    [
+                        models.FieldCondition(
+                            key="chapter",
+                            match=models.MatchValue(
+                                value=chapter_name,
+                            ),
+                        )
+                    ]
+                    if chapter_name
+                    else None
+                )
+            ),
+            dense_vectors=dense_query_vectors,
+            sparse_vectors=sparse_query_vectors,
+            limit=k,
+        )
+        # The same chunk is often found by several queries, merge them into one ranking
+        hits = fuse_results(hits, method=settings.RETRIEVAL_FUSION)
 
         logger.info("All documents retrieved successfully.", num_documents=len(hits))
 
@@ -1,9 +1,11 @@
+from functools import lru_cache
+
 import opik
-from langchain_openai import ChatOpenAI
 from opik.integrations.langchain import OpikTracer
 
 import core.logger_utils as logger_utils
 from core.config import settings
+from core.rag.llm_cache import get_chat_model, memoize
 from core.rag.prompt_templates import SelfQueryTemplate
 
 logger = logger_utils.get_logger(__name__)
@@ -15,17 +17,12 @@ class SelfQuery:
     @staticmethod
     @opik.track(name="SelQuery.generate_response")
     def generate_response(query: str) -> str | None:
-        prompt = SelfQueryTemplate().create_template()
-        model = ChatOpenAI(
+        chapter_name = memoize(
             model=settings.OPENAI_MODEL_ID,
-            api_key=settings.OPENAI_API_KEY,
-            temperature=0,
+            prompt=SelfQueryTemplate().prompt,
+            inputs={"question": query},
+            generate=lambda: get_chain().invoke({"question": query}).content,
         )
-        chain = prompt | model
-        chain = chain.with_config({"callbacks": [SelfQuery.opik_tracer]})
-
-        response = chain.invoke({"question": query})
-        chapter_name = response.content
 
         if chapter_name == "none":
             return None
@@ -36,3 +33,10 @@ class SelfQuery:
         )
 
         return chapter_name
+
+
+@lru_cache(maxsize=None)
+def get_chain():
+    chain = SelfQueryTemplate().create_template() | get_chat_model(temperature=0)
+
+    return chain.with_config({"callbacks": [SelfQuery.opik_tracer]})
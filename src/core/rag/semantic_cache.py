@@ -0,0 +1,277 @@
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+import core.logger_utils as logger_utils
+
+logger = logger_utils.get_logger(__name__)
+
+CACHE_MODES = ("answer", "context")
+
+
+class SemanticCacheBackend(ABC):
+    """Stores cache entries next to the unit-normalized embedding of their query."""
+
+    @abstractmethod
+    def search(self, vector: np.ndarray) -> tuple[float, dict] | None:
+        """Most similar entry as (cosine similarity, entry), None if the cache is empty."""
+        pass
+
+    @abstractmethod
+    def add(self, vector: np.ndarray, entry: dict) -> None:
+        pass
+
+    @abstractmethod
+    def drop_stale(self, version: str | None) -> None:
+        """Remove the entries cached for another version of the collection."""
+        pass
+
+
+class InMemorySemanticCache(SemanticCacheBackend):
+    """Brute-force cosine search over a float32 matrix, evicting the oldest entries above max_items."""
+
+    def __init__(self, max_items: int = 1000) -> None:
+        self.max_items = max_items
+        self._vectors: np.ndarray | None = None
+        self._entries: list[dict] = []
+        self._lock = threading.Lock()
+
+    def search(self, vector: np.ndarray) -> tuple[float, dict] | None:
+        with self._lock:
+            if not self._entries:
+                return None
+
+            scores = self._vectors @ vector
+            best = int(np.argmax(scores))
+
+            return float(scores[best]), self._entries[best]
+
+    def add(self, vector: np.ndarray, entry: dict) -> None:
+        with self._lock:
+            self._append(vector[np.newaxis, :], [entry])
+
+    def drop_stale(self, version: str | None) -> None:
+        with self._lock:
+            keep = [
+                index
+                for index, entry in enumerate(self._entries)
+                if entry["version"] == version
+            ]
+            if len(keep) == len(self._entries):
+                return
+
+            self._vectors = self._vectors[keep] if keep else None
+            self._entries = [self._entries[index] for index in keep]
+
+    def _append(self, vectors: np.ndarray, entries: list[dict]) -> None:
+        vectors = vectors.astype(np.float32, copy=False)
+        self._vectors = (
+            vectors if self._vectors is None else np.vstack([self._vectors, vectors])
+        )
+        self._entries.extend(entries)
+
+        overflow = len(self._entries) - self.max_items
+        if overflow > 0:
+            self._vectors = self._vectors[overflow:]
+            self._entries = self._entries[overflow:]
+
+
+class SQLiteSemanticCache(InMemorySemanticCache):
+    """In-memory cache whose entries are also written to SQLite and loaded back on start."""
+
+    def __init__(
+        self, path: str, max_items: int = 1000, table: str = "semantic_cache"
+    ) -> None:
+        super().__init__(max_items=max_items)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+        self.table = table
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(id INTEGER PRIMARY KEY AUTOINCREMENT, version TEXT, vector BLOB NOT NULL, entry BLOB NOT NULL)"
+            )
+            rows = self._connection.execute(
+                f"SELECT vector, entry FROM {table} ORDER BY id DESC LIMIT ?",
+                (max_items,),
+            ).fetchall()
+
+        if rows:
+            rows.reverse()
+            self._append(
+                np.stack(
+                    [np.frombuffer(vector, dtype=np.float32) for vector, _ in rows]
+                ),
+                [pickle.loads(entry) for _, entry in rows],
+            )
+
+        logger.info(
+            "Opened SQLite semantic cache.", path=path, num_entries=len(self._entries)
+        )
+
+    def add(self, vector: np.ndarray, entry: dict) -> None:
+        super().add(vector, entry)
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT INTO {self.table} (version, vector, entry) VALUES (?, ?, ?)",
+                (
+                    entry["version"],
+                    vector.astype(np.float32).tobytes(),
+                    pickle.dumps(entry),
+                ),
+            )
+            # Keep the table at the size of the in-memory cache
+            self._connection.execute(
+                f"DELETE FROM {self.table} WHERE id <= "
+                f"(SELECT MAX(id) FROM {self.table}) - ?",
+                (self.max_items,),
+            )
+
+    def drop_stale(self, version: str | None) -> None:
+        super().drop_stale(version)
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"DELETE FROM {self.table} WHERE version IS NOT ?", (version,)
+            )
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class SemanticCache:
+    """
+    Caches RAG results by query embedding, so paraphrases of an answered question skip the pipeline.
+
+    In "context" mode only the retrieved context is reused and the answer is generated again for the
+    new query, in "answer" mode the whole response is reused. Entries are dropped once the version
+    marker of the vector collection changes, which is checked at most every version_check_seconds.
+    """
+
+    def __init__(
+        self,
+        backend: SemanticCacheBackend,
+        threshold: float = 0.95,
+        mode: str = "context",
+        get_version: Callable[[], str | None] | None = None,
+        version_check_seconds: float = 30.0,
+    ) -> None:
+        if mode not in CACHE_MODES:
+            raise ValueError(
+                f"Unknown semantic cache mode: '{mode}'. Available: {list(CACHE_MODES)}"
+            )
+
+        self.backend = backend
+        self.threshold = threshold
+        self.mode = mode
+        self._get_version = get_version
+        self.version_check_seconds = version_check_seconds
+        self._version: str | None = None
+        self._version_checked_at: float | None = None
+        self._version_read = False
+
+    def lookup(self, query_vector: np.ndarray) -> dict | None:
+        """Cached entry of the most similar query, if it is at least threshold similar."""
+        self._refresh_version()
+
+        match = self.backend.search(normalize(query_vector))
+        if match is None:
+            return None
+
+        score, entry = match
+        if score < self.threshold or entry["version"] != self._version:
+            logger.debug("Semantic cache miss.", score=score)
+
+            return None
+
+        logger.info(
+            "Semantic cache hit.",
+            score=score,
+            cached_query=entry["query"],
+            mode=self.mode,
+        )
+
+        return entry
+
+    def store(
+        self, query: str, query_vector: np.ndarray, answer: str, context: list[str]
+    ) -> None:
+        entry = {"query": query, "context": context, "version": self._version}
+        if self.mode == "answer":
+            entry["answer"] = answer
+
+        self.backend.add(normalize(query_vector), entry)
+
+    def _refresh_version(self) -> None:
+        if self._get_version is None:
+            return
+
+        now = time.monotonic()
+        if (
+            self._version_checked_at is not None
+            and now - self._version_checked_at < self.version_check_seconds
+        ):
+            return
+
+        try:
+            version = self._get_version()
+        except Exception:
+            # Keep serving the known version rather than failing the request, and retry
+            # only after version_check_seconds so an unreachable Qdrant isn't queried on every lookup
+            logger.warning("Couldn't read the collection version.", exc_info=True)
+            self._version_checked_at = now
+
+            return
+
+        # The first successful read also drops the entries persisted for an older version
+        if version != self._version or not self._version_read:
+            self.backend.drop_stale(version)
+        self._version = version
+        self._version_read = True
+        self._version_checked_at = now
+
+    @classmethod
+    def from_settings(cls, settings, collection_name: str = "vector_nice"):
+        """Creates the cache configured in the settings, invalidated by the writes to collection_name."""
+        from core.db.qdrant import QdrantDatabaseConnector
+
+        backend_name = settings.SEMANTIC_CACHE_BACKEND.lower()
+        if backend_name == "memory":
+            backend = InMemorySemanticCache(max_items=settings.SEMANTIC_CACHE_MAX_ITEMS)
+        elif backend_name == "sqlite":
+            backend = SQLiteSemanticCache(
+                path=settings.SEMANTIC_CACHE_PATH,
+                max_items=settings.SEMANTIC_CACHE_MAX_ITEMS,
+            )
+        else:
+            raise ValueError(
+                f"Unknown semantic cache backend: '{backend_name}'. "
+                "Available: ['memory', 'sqlite']"
+            )
+
+        connection = QdrantDatabaseConnector()
+
+        return cls(
+            backend=backend,
+            threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+            mode=settings.SEMANTIC_CACHE_MODE.lower(),
+            get_version=lambda: connection.get_collection_version(collection_name),
+            version_check_seconds=settings.SEMANTIC_CACHE_VERSION_CHECK_SECONDS,
+        )
+
+
+def normalize(vector: np.ndarray) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    norm = np.linalg.norm(vector)
+
+    return vector / norm if norm else vector
@@ -5,68 +5,154 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 
 import json
-import logging
+import time
 
+import pika
 from bson import json_util
+from checkpoint import ResumeTokenStore, build_resume_token_store
 from config import settings
+from pymongo.database import Database
+from pymongo.errors import OperationFailure, PyMongoError
 
 from core.db.mongo import MongoDatabaseConnector
 from core.logger_utils import get_logger
-from core.mq import publish_to_rabbitmq
+from core.mq import RabbitMQPublisher
 
 logger = get_logger(__file__)
 
+# Crawl bookkeeping fields of NiceDocument, updating only these doesn't change the content
+CRAWL_METADATA_FIELDS = {"etag", "last_modified"}
+
+# ChangeStreamHistoryLost / ChangeStreamFatalError: the resume token fell off the oplog
+RESUME_TOKEN_LOST_ERROR_CODES = {280, 286}
+
+
+def build_message(change: dict) -> str | None:
+    """Serialize a change event into the message expected by the feature pipeline."""
+    data_type = change["ns"]["coll"]
+    entry_id = str(change["documentKey"]["_id"])
+
+    if is_metadata_only_update(change):
+        logger.info(f"Skipping crawl metadata update of document {entry_id}")
+        return None
+
+    # Inserts carry the document, updates get the current version through updateLookup
+    document = change.get("fullDocument")
+    if not document:
+        logger.warning(f"Document with id {entry_id} not found after update")
+        return None
+
+    document.pop("_id")
+    document["type"] = data_type
+    document["entry_id"] = entry_id
+
+    # Use json_util to serialize the document
+    return json.dumps(document, default=json_util.default)
+
+
+def is_metadata_only_update(change: dict) -> bool:
+    if change["operationType"] != "update":
+        return False
+
+    update_description = change.get("updateDescription", {})
+    updated_fields = set(update_description.get("updatedFields", {}))
+
+    return (
+        bool(updated_fields)
+        and updated_fields <= CRAWL_METADATA_FIELDS
+        and not update_description.get("removedFields")
+    )
+
+
+def watch_changes(
+    db: Database, publisher: RabbitMQPublisher, token_store: ResumeTokenStore
+) -> None:
+    """
+    Publish the changes of the watched collections to RabbitMQ in micro-batches.
+
+    The resume token is checkpointed only after a batch has been committed by the broker, so a
+    restart replays at most the last unpublished batch (at-least-once).
+    """
+    pipeline = [
+        {
+            "$match": {
+                "operationType": {"$in": ["insert", "update", "replace"]},
+                # Also keeps the checkpoint collection's own writes out of the stream
+                "ns.coll": {"$in": settings.CDC_WATCHED_COLLECTIONS},
+            }
+        }
+    ]
+
+    resume_token = token_store.load()
+    logger.info("Watching changes.", resumed=resume_token is not None)
+
+    with db.watch(
+        pipeline,
+        full_document="updateLookup",
+        resume_after=resume_token,
+        batch_size=settings.CDC_BATCH_SIZE,
+        max_await_time_ms=settings.CDC_BATCH_MAX_WAIT_MS,
+    ) as stream:
+        batch = []
+        batch_started_at = None
+
+        while stream.alive:
+            change = stream.try_next()
+
+            if change is not None:
+                data = build_message(change)
+                if data is not None:
+                    batch.append(data)
+                    batch_started_at = batch_started_at or time.monotonic()
+
+            batch_age_ms = (
+                (time.monotonic() - batch_started_at) * 1000 if batch_started_at else 0
+            )
+            if batch and (
+                change is None
+                or len(batch) >= settings.CDC_BATCH_SIZE
+                or batch_age_ms >= settings.CDC_BATCH_MAX_WAIT_MS
+            ):
+                publisher.publish_batch(
+                    queue_name=settings.RABBITMQ_QUEUE_NAME, messages=batch
+                )
+                logger.info(
+                    "Changes published to RabbitMQ.",
+                    num=len(batch),
+                    queue_name=settings.RABBITMQ_QUEUE_NAME,
+                )
+
+                batch = []
+                batch_started_at = None
+
+            # Also advances over filtered events while idle, so they are not rescanned after a restart
+            if not batch and stream.resume_token != resume_token:
+                resume_token = stream.resume_token
+                token_store.save(resume_token)
+
 
 def stream_process():
-    try:
-        client = MongoDatabaseConnector()
-        db = client["pharmassist"]
-        logging.info("Connected to MongoDB.")
-
-        # Watch changes in a specific collection
-        changes = db.watch(
-            [{"$match": {"operationType": {"$in": ["insert", "update"]}}}]
-        )
-        for change in changes:
-            data_type = change["ns"]["coll"]
-
-            # Handle different operation types
-            if change["operationType"] == "insert":
-                entry_id = str(change["fullDocument"]["_id"])
-                document = change["fullDocument"]
-            elif change["operationType"] == "update":
-                entry_id = str(change["documentKey"]["_id"])
-                # For updates, we need to fetch the full document
-                document = db[data_type].find_one({"_id": change["documentKey"]["_id"]})
-                if not document:
-                    logger.warning(
-                        f"Document with id {entry_id} not found after update"
+    client = MongoDatabaseConnector()
+    db = client[settings.MONGO_DATABASE_NAME]
+    token_store = build_resume_token_store(db)
+
+    # One connection and channel for the whole stream instead of one per change event
+    with RabbitMQPublisher() as publisher:
+        while True:
+            try:
+                watch_changes(db=db, publisher=publisher, token_store=token_store)
+            except OperationFailure as e:
+                if e.code not in RESUME_TOKEN_LOST_ERROR_CODES:
+                    logger.exception("Change stream failed. Reconnecting...")
+                else:
+                    logger.error(
+                        "Resume token is no longer in the oplog. Changes made while the CDC was down must be re-crawled."
                     )
-                    continue
-            else:
-                logger.warning(f"Unsupported operation type: {change['operationType']}")
-                continue
-
-            document.pop("_id")
-            document["type"] = data_type
-            document["entry_id"] = entry_id
-
-            if data_type not in ["NICE_GUIDELINE", "test_collection"]:
-                logging.info(f"Unsupported data type: '{data_type}'")
-                continue
-
-            # Use json_util to serialize the document
-            data = json.dumps(document, default=json_util.default)
-            logger.info(
-                f"Change detected and serialized for a data sample of type {data_type}."
-            )
-
-            # Send data to rabbitmq
-            publish_to_rabbitmq(queue_name=settings.RABBITMQ_QUEUE_NAME, data=data)
-            logger.info(f"Data of type '{data_type}' published to RabbitMQ.")
+                    token_store.clear()
+            except (PyMongoError, pika.exceptions.AMQPError):
+                logger.exception("CDC stream interrupted. Reconnecting...")
 
-    except Exception as e:
-        logger.error(f"An error occurred: {e}")
+            time.sleep(settings.CDC_RECONNECT_DELAY_SECONDS)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from bson import json_util
+from config import settings
+from pymongo.database import Database
+
+from core.logger_utils import get_logger
+
+logger = get_logger(__file__)
+
+
+class ResumeTokenStore(ABC):
+    """Durable storage for the change stream resume token of the CDC service."""
+
+    @abstractmethod
+    def load(self) -> dict | None:
+        pass
+
+    @abstractmethod
+    def save(self, resume_token: dict) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+
+class FileResumeTokenStore(ResumeTokenStore):
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def load(self) -> dict | None:
+        if not self.path.exists():
+            return None
+
+        return json_util.loads(self.path.read_text())
+
+    def save(self, resume_token: dict) -> None:
+        # Write then rename, so a crash never leaves a truncated token behind
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json_util.dumps(resume_token))
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+class MongoResumeTokenStore(ResumeTokenStore):
+    def __init__(self, database: Database, collection_name: str, stream_name: str):
+        self._collection = database[collection_name]
+        self._stream_name = stream_name
+
+    def load(self) -> dict | None:
+        checkpoint = self._collection.find_one({"_id": self._stream_name})
+        if not checkpoint:
+            return None
+
+        return checkpoint["resume_token"]
+
+    def save(self, resume_token: dict) -> None:
+        self._collection.update_one(
+            {"_id": self._stream_name},
+            {"$set": {"resume_token": resume_token}},
+            upsert=True,
+        )
+
+    def clear(self) -> None:
+        self._collection.delete_one({"_id": self._stream_name})
+
+
+def build_resume_token_store(database: Database) -> ResumeTokenStore:
+    if settings.CDC_CHECKPOINT_BACKEND == "mongo":
+        return MongoResumeTokenStore(
+            database=database,
+            collection_name=settings.CDC_CHECKPOINT_COLLECTION,
+            stream_name=settings.CDC_STREAM_NAME,
+        )
+    elif settings.CDC_CHECKPOINT_BACKEND == "file":
+        return FileResumeTokenStore(path=settings.CDC_CHECKPOINT_PATH)
+    else:
+        raise ValueError(
+            f"Unsupported CDC checkpoint backend: {settings.CDC_CHECKPOINT_BACKEND}"
+        )
@@ -17,5 +17,18 @@ class Settings(BaseSettings):
     RABBITMQ_DEFAULT_PASSWORD: str = "guest"
     RABBITMQ_QUEUE_NAME: str = "default"
 
+    # Change stream config
+    CDC_WATCHED_COLLECTIONS: list[str] = ["NICE_GUIDELINE", "test_collection"]
+    CDC_BATCH_SIZE: int = 32
+    # Max time a change waits in a partial batch before it is published
+    CDC_BATCH_MAX_WAIT_MS: int = 500
+    CDC_RECONNECT_DELAY_SECONDS: float = 5.0
+
+    # Resume token checkpointing ("mongo" or "file")
+    CDC_CHECKPOINT_BACKEND: str = "mongo"
+    CDC_CHECKPOINT_COLLECTION: str = "cdc_checkpoints"
+    CDC_CHECKPOINT_PATH: str = str(Path(ROOT_DIR) / ".cache" / "cdc_resume_token.json")
+    CDC_STREAM_NAME: str = "pharmassist"
+
 
 settings = Settings()
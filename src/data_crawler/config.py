@@ -0,0 +1,30 @@
+from pathlib import Path
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+ROOT_DIR = str(Path(__file__).parent.parent.parent)
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=ROOT_DIR, env_file_encoding="utf-8")
+
+    # Crawler backend: "selenium" (headless Chrome) or "http" (concurrent async HTTP client)
+    CRAWLER_BACKEND: str = "selenium"
+
+    # Selenium crawler config: the browser is restarted after this many page loads (every chapter
+    # of a guideline is one), at the end of the crawl that reaches it
+    BROWSER_MAX_PAGES: int = 50
+
+    # HTTP crawler config
+    HTTP_USER_AGENT: str = "Mozilla/5.0 (compatible; PharmAssistCrawler/1.0)"
+    HTTP_TIMEOUT_SECONDS: float = 30.0
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_RETRIES: int = 3
+    # Politeness limits, applied per host
+    HTTP_MAX_CONCURRENCY_PER_HOST: int = 8
+    HTTP_REQUESTS_PER_SECOND_PER_HOST: float = 5.0
+    # Guidelines crawled at the same time by AsyncNiceCrawler.extract_many
+    HTTP_MAX_CONCURRENT_DOCUMENTS: int = 10
+
+
+settings = Settings()
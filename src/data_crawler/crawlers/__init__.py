@@ -1,3 +1,4 @@
 from .nice import NiceCrawler
+from .nice_http import AsyncNiceCrawler
 
-__all__ = ["NiceCrawler"]
+__all__ = ["NiceCrawler", "AsyncNiceCrawler"]
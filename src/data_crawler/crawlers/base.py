@@ -1,44 +1,56 @@
 from abc import ABC, abstractmethod
-from tempfile import mkdtemp
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 
 from core.db.documents import BaseDocument
+from crawlers.browser import BrowserPool
 
+# One warm browser per crawler class, kept for the lifetime of the process
+_browser_pools: dict[type, BrowserPool] = {}
 
-class BaseAbstractCrawler(ABC):
+
+class BaseCrawler(ABC):
     model: type[BaseDocument]
 
+    @abstractmethod
+    def extract(self, link: str, **kwargs) -> None: ...
+
+
+class BaseAbstractCrawler(BaseCrawler):
+    """Base class for crawlers driving a headless Chrome through Selenium."""
+
     def __init__(self, doc_limit: int = 3) -> None:
         self.doc_limit = doc_limit
+        self._driver: webdriver.Chrome | None = None
 
-        options = webdriver.ChromeOptions()
-
-        options.add_argument("--headless=new")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--window-size=1280x1696")
-        options.add_argument("--single-process")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-dev-tools")
-        options.add_argument("--no-zygote")
-        options.add_argument(f"--user-data-dir={mkdtemp()}")
-        options.add_argument(f"--data-path={mkdtemp()}")
-        options.add_argument(f"--disk-cache-dir={mkdtemp()}")
-        options.add_argument("--remote-debugging-port=9222")
-        options.binary_location = "/opt/chrome/chrome"
-
-        self.set_extra_driver_options(options)
-
-        self.driver = webdriver.Chrome(
-            service=Service(executable_path="/opt/chromedriver"),
-            options=options,
-        )
+    @property
+    def driver(self) -> webdriver.Chrome:
+        """Browser borrowed from the pool, only started the first time a page is actually needed."""
+        if self._driver is None:
+            self._driver = self._get_browser_pool().acquire()
+
+        return self._driver
+
+    def load_page(self, url: str) -> None:
+        """Navigate the browser to url, counting the page load towards the browser restart."""
+        self.driver.get(url)
+        self._get_browser_pool().record_page_load()
+
+    def release_driver(self, failed: bool = False) -> None:
+        """Give the browser back to the pool. A failed crawl restarts it."""
+        if self._driver is not None:
+            self._driver = None
+            self._get_browser_pool().release(failed=failed)
 
     def set_extra_driver_options(self, options: Options) -> None:
         pass
 
-    @abstractmethod
-    def extract(self, link: str, **kwargs) -> None: ...
+    def _get_browser_pool(self) -> BrowserPool:
+        crawler_type = type(self)
+        if crawler_type not in _browser_pools:
+            _browser_pools[crawler_type] = BrowserPool(
+                set_extra_driver_options=self.set_extra_driver_options
+            )
+
+        return _browser_pools[crawler_type]
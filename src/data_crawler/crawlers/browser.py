@@ -0,0 +1,113 @@
+import shutil
+import threading
+from tempfile import mkdtemp
+from typing import Callable
+
+from aws_lambda_powertools import Logger
+from config import settings
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+logger = Logger(service="pharmassist/crawler")
+
+
+class BrowserPool:
+    """
+    Keeps a headless Chrome alive across crawls (and across invocations of a warm Lambda container).
+
+    The browser is restarted after a failed crawl, when it stops responding, or at the end of the crawl
+    during which it loaded its max_pages-th page, to bound memory growth. Page loads are reported by
+    the crawlers through record_page_load.
+    """
+
+    def __init__(
+        self,
+        set_extra_driver_options: Callable[[Options], None] | None = None,
+        max_pages: int | None = None,
+    ) -> None:
+        self.set_extra_driver_options = set_extra_driver_options
+        self.max_pages = max_pages or settings.BROWSER_MAX_PAGES
+
+        self._driver: webdriver.Chrome | None = None
+        self._temp_dirs: list[str] = []
+        self._pages = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> webdriver.Chrome:
+        with self._lock:
+            if self._driver is not None and not self._is_alive():
+                logger.warning("Browser stopped responding. Restarting it.")
+                self._quit()
+
+            if self._driver is None:
+                self._driver = self._start()
+
+            return self._driver
+
+    def record_page_load(self) -> None:
+        with self._lock:
+            self._pages += 1
+
+    def release(self, failed: bool = False) -> None:
+        with self._lock:
+            if failed or self._pages >= self.max_pages:
+                logger.info(
+                    "Recycling browser.", failed=failed, pages_loaded=self._pages
+                )
+                self._quit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._quit()
+
+    def _start(self) -> webdriver.Chrome:
+        self._temp_dirs = [mkdtemp() for _ in range(3)]
+        user_data_dir, data_path, disk_cache_dir = self._temp_dirs
+
+        options = webdriver.ChromeOptions()
+
+        options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--window-size=1280x1696")
+        options.add_argument("--single-process")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-dev-tools")
+        options.add_argument("--no-zygote")
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+        options.add_argument(f"--data-path={data_path}")
+        options.add_argument(f"--disk-cache-dir={disk_cache_dir}")
+        options.add_argument("--remote-debugging-port=9222")
+        options.binary_location = "/opt/chrome/chrome"
+
+        if self.set_extra_driver_options:
+            self.set_extra_driver_options(options)
+
+        self._pages = 0
+
+        return webdriver.Chrome(
+            service=Service(executable_path="/opt/chromedriver"),
+            options=options,
+        )
+
+    def _is_alive(self) -> bool:
+        try:
+            _ = self._driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def _quit(self) -> None:
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception as e:
+                print(f"Error closing driver: {e}")
+            self._driver = None
+
+        # Lambda only has a small /tmp, so the browser profile directories are removed with it
+        for temp_dir in self._temp_dirs:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        self._temp_dirs = []
@@ -0,0 +1,111 @@
+import asyncio
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+import httpx
+from config import settings
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class HostRateLimiter:
+    """Caps the number of in-flight requests and the request rate for every host."""
+
+    def __init__(self, max_concurrency: int, requests_per_second: float) -> None:
+        self.max_concurrency = max_concurrency
+        self.interval = 1 / requests_per_second if requests_per_second > 0 else 0
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._next_slots: dict[str, float] = {}
+
+    @asynccontextmanager
+    async def limit(self, host: str):
+        semaphore = self._semaphores.setdefault(
+            host, asyncio.Semaphore(self.max_concurrency)
+        )
+        async with semaphore:
+            await self._wait_for_slot(host)
+            yield
+
+    async def _wait_for_slot(self, host: str) -> None:
+        # No await between reading and booking the slot, so this is safe within one event loop
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slots.get(host, now))
+        self._next_slots[host] = slot + self.interval
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class AsyncHTTPFetcher:
+    """Pooled asyncio HTTP client with per-host rate limiting and retries on transient errors."""
+
+    def __init__(self, rate_limiter: HostRateLimiter | None = None) -> None:
+        self._rate_limiter = rate_limiter or HostRateLimiter(
+            max_concurrency=settings.HTTP_MAX_CONCURRENCY_PER_HOST,
+            requests_per_second=settings.HTTP_REQUESTS_PER_SECOND_PER_HOST,
+        )
+        self._client = httpx.AsyncClient(
+            headers={"User-Agent": settings.HTTP_USER_AGENT},
+            timeout=settings.HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_CONNECTIONS,
+            ),
+            follow_redirects=True,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """GET with retries. 4xx and 5xx responses are raised, 304 responses are returned."""
+        host = urlsplit(url).netloc
+
+        for attempt in range(settings.HTTP_MAX_RETRIES + 1):
+            is_last_attempt = attempt == settings.HTTP_MAX_RETRIES
+            try:
+                async with self._rate_limiter.limit(host):
+                    response = await self._client.get(url, **kwargs)
+            except httpx.TransportError:
+                if is_last_attempt:
+                    raise
+                await asyncio.sleep(2**attempt)
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES and not is_last_attempt:
+                await asyncio.sleep(get_retry_delay(response, attempt))
+                continue
+
+            # 304 is not an error, it answers a conditional request
+            if response.is_error:
+                response.raise_for_status()
+
+            return response
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def fetch(url: str, headers: dict | None = None) -> httpx.Response:
+    """Blocking GET for the Selenium crawler. 4xx and 5xx responses are raised, 304 responses are returned."""
+    response = httpx.get(
+        url,
+        headers={"User-Agent": settings.HTTP_USER_AGENT, **(headers or {})},
+        timeout=settings.HTTP_TIMEOUT_SECONDS,
+        follow_redirects=True,
+    )
+    if response.is_error:
+        response.raise_for_status()
+
+    return response
+
+
+def get_retry_delay(response: httpx.Response, attempt: int) -> float:
+    retry_after = response.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+
+    return float(2**attempt)
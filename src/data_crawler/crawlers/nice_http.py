@@ -0,0 +1,121 @@
+import asyncio
+from typing import Callable
+
+import httpx
+from config import settings
+from extractors import extract_chapter_markdown, extract_guideline
+
+from core.db.documents import NiceDocument
+from crawlers.base import BaseCrawler
+from crawlers.http_client import AsyncHTTPFetcher
+from crawlers.nice import (
+    EXISTING_DOC_PROJECTION,
+    build_conditional_headers,
+    get_validators,
+    needs_update,
+    save_document,
+    save_validators,
+)
+
+
+class AsyncNiceCrawler(BaseCrawler):
+    """
+    Crawls NICE guidelines over plain HTTP instead of a browser (the pages are server-rendered).
+
+    The chapters of a guideline, and several guidelines with extract_many, are fetched concurrently.
+    """
+
+    model = NiceDocument
+
+    def extract(self, link: str, **kwargs) -> None:
+        asyncio.run(self._extract_with_fetcher(link))
+
+    def extract_many(
+        self,
+        links: list[str],
+        on_done: Callable[[str, Exception | None], None] | None = None,
+    ) -> dict[str, Exception | None]:
+        """Crawl all links concurrently. Returns the error (or None) of every link."""
+        return asyncio.run(self.extract_many_async(links, on_done=on_done))
+
+    async def extract_many_async(
+        self,
+        links: list[str],
+        fetcher: AsyncHTTPFetcher | None = None,
+        on_done: Callable[[str, Exception | None], None] | None = None,
+    ) -> dict[str, Exception | None]:
+        """on_done is called with the link and its error (or None) as soon as each link is crawled."""
+        if fetcher is None:
+            async with AsyncHTTPFetcher() as fetcher:
+                return await self.extract_many_async(
+                    links, fetcher=fetcher, on_done=on_done
+                )
+
+        semaphore = asyncio.Semaphore(settings.HTTP_MAX_CONCURRENT_DOCUMENTS)
+
+        async def extract_one(link: str) -> Exception | None:
+            error = None
+            async with semaphore:
+                try:
+                    await self.extract_async(link, fetcher=fetcher)
+                except Exception as e:
+                    print(f"Error during extraction of {link}: {e}")
+                    error = e
+
+            if on_done is not None:
+                on_done(link, error)
+
+            return error
+
+        errors = await asyncio.gather(*(extract_one(link) for link in links))
+
+        return dict(zip(links, errors))
+
+    async def extract_async(self, link: str, fetcher: AsyncHTTPFetcher) -> None:
+        # pymongo is blocking, so database calls run off the event loop
+        existing_doc = await asyncio.to_thread(
+            self.model.find, projection=EXISTING_DOC_PROJECTION, url=link
+        )
+
+        print(f"Fetching: {link}")
+        response = await fetcher.get(
+            link, headers=build_conditional_headers(existing_doc)
+        )
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            print(f"Document not modified since the last crawl: {link}")
+            return
+
+        validators = get_validators(response)
+        guideline = extract_guideline(response.text)
+        if not needs_update(
+            existing_doc, guideline["title"], guideline["last_updated"]
+        ):
+            await asyncio.to_thread(save_validators, existing_doc, validators)
+            return
+
+        chapter_responses = await asyncio.gather(
+            *(fetcher.get(chapter_url) for _, chapter_url in guideline["chapters"])
+        )
+
+        result_data = {
+            "title": guideline["title"],
+            "url": link,
+            "last_updated": guideline["last_updated"],
+            "chapters": [
+                {
+                    "title": chapter_title,
+                    "url": chapter_url,
+                    "markdown": extract_chapter_markdown(chapter_response.text),
+                }
+                for (chapter_title, chapter_url), chapter_response in zip(
+                    guideline["chapters"], chapter_responses
+                )
+            ],
+            **validators,
+        }
+
+        await asyncio.to_thread(save_document, self.model, existing_doc, result_data)
+
+    async def _extract_with_fetcher(self, link: str) -> None:
+        async with AsyncHTTPFetcher() as fetcher:
+            await self.extract_async(link, fetcher=fetcher)
@@ -1,7 +1,7 @@
 import re
 
 from aws_lambda_powertools import Logger
-from crawlers.base import BaseAbstractCrawler
+from crawlers.base import BaseCrawler
 
 logger = Logger(service="pharmassist/crawler")
 
@@ -10,12 +10,12 @@ class CrawlerDispatcher:
     def __init__(self) -> None:
         self._crawlers = {}
 
-    def register(self, domain: str, crawler: type[BaseAbstractCrawler]) -> None:
+    def register(self, domain: str, crawler: type[BaseCrawler]) -> None:
         self._crawlers[r"https://(www\.)?{}.org.uk/*".format(re.escape(domain))] = (
             crawler
         )
 
-    def get_crawler(self, url: str) -> BaseAbstractCrawler:
+    def get_crawler(self, url: str) -> BaseCrawler:
         for pattern, crawler in self._crawlers.items():
             if re.match(pattern, url):
                 return crawler()
@@ -0,0 +1,3 @@
+from .nice import extract_chapter_markdown, extract_guideline
+
+__all__ = ["extract_chapter_markdown", "extract_guideline"]
@@ -0,0 +1,220 @@
+from lxml import html as lxml_html
+from lxml.html import HtmlElement
+
+NICE_BASE_URL = "https://www.nice.org.uk"
+
+# Text inside these tags is not part of the page text (same as BeautifulSoup's get_text)
+SKIPPED_TEXT_TAGS = {"script", "style", "template"}
+
+
+def extract_guideline(html: str) -> dict:
+    """Extract the title, last updated date and chapter links of a NICE guideline page."""
+    root = parse_html(html)
+    if root is None:
+        return {"title": "Unknown Title", "last_updated": None, "chapters": []}
+
+    title_element = find(root, ("h1",), class_="page-header__heading")
+    title = (
+        get_text(title_element).strip()
+        if title_element is not None
+        else "Unknown Title"
+    )
+
+    # Extract last updated date
+    published_date = None
+    last_updated = None
+    metadata = find(root, ("ul",), class_="page-header__metadata")
+    if metadata is not None:
+        for li in metadata.iterdescendants("li"):
+            li_text = get_text(li)
+
+            if "Last updated" in li_text:
+                last_updated = get_date(li, li_text, "Last updated:")
+            if "Published" in li_text:
+                published_date = get_date(li, li_text, "Published:")
+    if last_updated is None:
+        last_updated = published_date
+
+    # Extract chapters navigation
+    chapters = []
+    nav_list = find(root, ("ul",), class_="stacked-nav__list")
+    if nav_list is not None:
+        for chapter_link in nav_list.iterdescendants("a"):
+            chapter_url = NICE_BASE_URL + chapter_link.attrib["href"]
+            chapter_title = get_text(
+                find(chapter_link, ("span",), class_="stacked-nav__content-wrapper")
+            ).strip()
+            chapters.append((chapter_title, chapter_url))
+
+    return {"title": title, "last_updated": last_updated, "chapters": chapters}
+
+
+def extract_chapter_markdown(html: str) -> str:
+    """
+    Convert the content of a NICE chapter page to markdown.
+
+    Walks the content once and collects the markdown pieces in a list, joined at the end.
+    """
+    root = parse_html(html)
+    if root is None:
+        return ""
+
+    parts = []
+
+    # Extract content from the main content div
+    content_div = find(root, ("div",), attrs={"data-g": "12"})
+    if content_div is None:
+        return ""
+
+    nav_target_div = find(content_div, ("div",), class_="js-in-page-nav-target")
+    if nav_target_div is None:
+        # Fallback: just get all text from content_div with basic markdown formatting
+        parts.append(
+            "\n\n".join(text.strip() for text in iter_text(content_div) if text.strip())
+        )
+    else:
+        # For chapters other than overview, the chapter div is the content source
+        chapter_div = find(nav_target_div, ("div",), class_="chapter")
+        content_source = chapter_div if chapter_div is not None else nav_target_div
+
+        main_title = find(content_source, ("h1", "h2"), class_="title")
+        if main_title is not None:
+            parts.append(f"# {get_text(main_title).strip()}\n\n")
+
+        sections = list(content_source.iterchildren("div", "p", "h3", "h4"))
+        if sections:
+            for section in sections:
+                append_section(parts, section)
+        else:
+            # Get all text with heading structure preserved
+            for heading in content_source.iterdescendants(
+                "h1", "h2", "h3", "h4", "h5", "h6"
+            ):
+                append_heading_siblings(parts, heading)
+
+    # Clean up any excessive newlines
+    return "".join(parts).replace("\n\n\n", "\n\n")
+
+
+def append_section(parts: list[str], section: HtmlElement) -> None:
+    if section.tag in ("h3", "h4"):
+        parts.append(f"{'#' * int(section.tag[1])} {get_text(section).strip()}\n\n")
+    elif section.tag == "p":
+        parts.append(f"{link_to_markdown(section)}\n\n")
+    elif section.tag == "div" and has_class(section, "section"):
+        # It's a nested section with a title
+        section_title = find(section, ("h3", "h4"), class_="title")
+        if section_title is not None:
+            parts.append(
+                f"{'#' * int(section_title.tag[1])} {get_text(section_title).strip()}\n\n"
+            )
+
+        # Get all paragraphs and lists in this section
+        for element in section.iterdescendants("p", "ul", "ol"):
+            if element.tag == "p":
+                parts.append(f"{link_to_markdown(element)}\n\n")
+            else:
+                for i, li in enumerate(element.iterdescendants("li")):
+                    li_text = link_to_markdown(li)
+                    if element.tag == "ol":
+                        parts.append(f"{i + 1}. {li_text}\n")
+                    else:
+                        parts.append(f"* {li_text}\n")
+                parts.append("\n")
+
+
+def append_heading_siblings(parts: list[str], heading: HtmlElement) -> None:
+    parts.append(f"{'#' * int(heading.tag[1])} {get_text(heading).strip()}\n\n")
+
+    # Get paragraphs and lists that follow until next heading
+    next_el = next_sibling(heading)
+    while next_el is not None and not next_el.tag.startswith("h"):
+        if next_el.tag == "p":
+            parts.append(f"{link_to_markdown(next_el)}\n\n")
+        elif next_el.tag in ("ul", "ol"):
+            for i, li in enumerate(next_el.iterdescendants("li")):
+                if next_el.tag == "ol":
+                    parts.append(f"{i + 1}. {get_text(li).strip()}\n")
+                else:
+                    parts.append(f"* {get_text(li).strip()}\n")
+            parts.append("\n")
+        next_el = next_sibling(next_el)
+
+
+def link_to_markdown(element: HtmlElement) -> str:
+    """Text of the element with the text of its links replaced by markdown links."""
+    text = get_text(element).strip()
+    for link in element.iterdescendants("a"):
+        link_url = link.get("href")
+        if link_url is None:
+            continue
+
+        link_text = get_text(link).strip()
+        if not link_url.startswith("http"):
+            link_url = NICE_BASE_URL + link_url
+        text = text.replace(link_text, f"[{link_text}]({link_url})")
+
+    return text
+
+
+def get_date(li: HtmlElement, li_text: str, label: str) -> str:
+    # Prefer the datetime attribute of the time element, otherwise use the text
+    time_element = find(li, ("time",))
+    if time_element is not None and time_element.get("datetime") is not None:
+        return time_element.get("datetime")
+
+    return li_text.replace(label, "").strip()
+
+
+def parse_html(html: str) -> HtmlElement | None:
+    if not html or not html.strip():
+        return None
+
+    return lxml_html.document_fromstring(html)
+
+
+def find(
+    element: HtmlElement,
+    tags: tuple[str, ...],
+    class_: str | None = None,
+    attrs: dict[str, str] | None = None,
+) -> HtmlElement | None:
+    """First descendant in document order with one of the tags, the class and the attribute values."""
+    for node in element.iterdescendants(*tags):
+        if class_ is not None and not has_class(node, class_):
+            continue
+        if attrs and any(node.get(key) != value for key, value in attrs.items()):
+            continue
+
+        return node
+
+    return None
+
+
+def has_class(element: HtmlElement, class_: str) -> bool:
+    return class_ in element.get("class", "").split()
+
+
+def next_sibling(element: HtmlElement) -> HtmlElement | None:
+    """Next sibling element, skipping comments and processing instructions."""
+    node = element.getnext()
+    while node is not None and not isinstance(node.tag, str):
+        node = node.getnext()
+
+    return node
+
+
+def get_text(element: HtmlElement) -> str:
+    return "".join(iter_text(element))
+
+
+def iter_text(element: HtmlElement):
+    """Text nodes under the element in document order, without comments and script/style contents."""
+    if element.text:
+        yield element.text
+
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in SKIPPED_TEXT_TAGS:
+            yield from iter_text(child)
+        if child.tail:
+            yield child.tail
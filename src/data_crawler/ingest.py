@@ -0,0 +1,214 @@
+import os
+import sys
+
+# Add the project root to path to resolve module imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+
+LOCAL_LAMBDA_URL = "http://localhost:9010/2015-03-31/functions/function/invocations"
+# Max entries of an SQS SendMessageBatch request
+SQS_BATCH_SIZE = 10
+
+
+class ProgressReport:
+    """Prints the progress and throughput of an ingestion run."""
+
+    def __init__(self, total: int, every: int = 10) -> None:
+        self.total = total
+        self.every = every
+        self.done = 0
+        self.failed = 0
+        self.started_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def update(self, num: int = 1, failed: int = 0) -> None:
+        with self._lock:
+            previous = self.done
+            self.done += num
+            self.failed += failed
+
+            if (
+                self.done // self.every > previous // self.every
+                or self.done >= self.total
+            ):
+                print(self.summary())
+
+    def summary(self) -> str:
+        elapsed = time.monotonic() - self.started_at
+        rate = self.done / elapsed if elapsed else 0.0
+        remaining = (self.total - self.done) / rate if rate else float("nan")
+
+        return (
+            f"{self.done}/{self.total} link(s) done, {self.failed} failed, "
+            f"{rate:.2f} links/s, elapsed {elapsed:.0f}s, eta {remaining:.0f}s"
+        )
+
+
+def read_links(path: Path) -> list[str]:
+    """Links of the file, stripped and deduplicated, in file order."""
+    links = (line.strip() for line in path.read_text(encoding="utf-8").splitlines())
+
+    return list(dict.fromkeys(link for link in links if link))
+
+
+def filter_crawled(links: list[str]) -> list[str]:
+    from core.db.documents import NiceDocument
+
+    NiceDocument.ensure_indexes()
+    # Served from the url index
+    crawled = set(NiceDocument.distinct("url"))
+
+    return [link for link in links if link not in crawled]
+
+
+def batched(items: list, size: int) -> list[list]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def ingest_local(links: list[str], progress: ProgressReport) -> None:
+    """Crawl in-process with the concurrent HTTP crawler."""
+    from crawlers import AsyncNiceCrawler
+
+    AsyncNiceCrawler().extract_many(
+        links, on_done=lambda _, error: progress.update(failed=int(error is not None))
+    )
+
+
+async def ingest_lambda(
+    links: list[str],
+    progress: ProgressReport,
+    url: str,
+    records_per_invocation: int,
+    concurrency: int,
+) -> None:
+    """Invoke the crawler Lambda (or its local Docker emulator) with batches of SQS-like records."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def invoke(client: httpx.AsyncClient, batch: list[str]) -> None:
+        event = {
+            "Records": [
+                {"messageId": str(index), "body": link}
+                for index, link in enumerate(batch)
+            ]
+        }
+
+        async with semaphore:
+            try:
+                response = await client.post(url, content=json.dumps(event))
+                response.raise_for_status()
+                failures = response.json().get("batchItemFailures", [])
+            except Exception as e:
+                print(f"Lambda invocation failed: {e}")
+                failures = [
+                    {"itemIdentifier": str(index)} for index in range(len(batch))
+                ]
+
+        for failure in failures:
+            print(f"Failed to crawl {batch[int(failure['itemIdentifier'])]}")
+        progress.update(num=len(batch), failed=len(failures))
+
+    # Crawls can take minutes, so no read timeout
+    async with httpx.AsyncClient(timeout=httpx.Timeout(10.0, read=None)) as client:
+        await asyncio.gather(
+            *(invoke(client, batch) for batch in batched(links, records_per_invocation))
+        )
+
+
+def ingest_sqs(
+    links: list[str],
+    progress: ProgressReport,
+    queue_url: str,
+    endpoint_url: str | None,
+) -> None:
+    """Send the links to the crawler queue, SQS_BATCH_SIZE messages per request."""
+    import boto3
+
+    sqs = boto3.client("sqs", endpoint_url=endpoint_url)
+
+    for batch in batched(links, SQS_BATCH_SIZE):
+        response = sqs.send_message_batch(
+            QueueUrl=queue_url,
+            Entries=[
+                {"Id": str(index), "MessageBody": link}
+                for index, link in enumerate(batch)
+            ],
+        )
+
+        failed = response.get("Failed", [])
+        for failure in failed:
+            print(
+                f"Failed to send {batch[int(failure['Id'])]}: {failure.get('Message')}"
+            )
+        progress.update(num=len(batch), failed=len(failed))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk ingest NICE guideline links.")
+    parser.add_argument("--links", type=Path, default=ROOT_DIR / "data" / "links.txt")
+    parser.add_argument(
+        "--target",
+        choices=["local", "lambda", "sqs"],
+        default="local",
+        help="local: crawl in this process, lambda: invoke the crawler Lambda, sqs: enqueue the links.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Also send links whose guideline is already in MongoDB.",
+    )
+    parser.add_argument("--lambda-url", default=LOCAL_LAMBDA_URL)
+    parser.add_argument("--records-per-invocation", type=int, default=SQS_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--queue-url", default=os.environ.get("SQS_QUEUE_URL"))
+    parser.add_argument(
+        "--endpoint-url",
+        default=None,
+        help="SQS endpoint, e.g. of a local SQS stand-in.",
+    )
+    args = parser.parse_args()
+
+    links = read_links(args.links)
+    print(f"Read {len(links)} unique link(s) from {args.links}")
+
+    if not args.force:
+        links = filter_crawled(links)
+        print(f"{len(links)} link(s) not crawled yet")
+
+    progress = ProgressReport(total=len(links))
+
+    if args.target == "local":
+        ingest_local(links, progress)
+    elif args.target == "lambda":
+        asyncio.run(
+            ingest_lambda(
+                links,
+                progress,
+                url=args.lambda_url,
+                records_per_invocation=args.records_per_invocation,
+                concurrency=args.concurrency,
+            )
+        )
+    else:
+        if not args.queue_url:
+            parser.error(
+                "--queue-url (or SQS_QUEUE_URL) is required for the sqs target"
+            )
+        ingest_sqs(
+            links, progress, queue_url=args.queue_url, endpoint_url=args.endpoint_url
+        )
+
+    print(f"Finished: {progress.summary()}")
+
+
+if __name__ == "__main__":
+    main()
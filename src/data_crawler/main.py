@@ -8,25 +8,55 @@ from typing import Any
 
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from crawlers import NiceCrawler
+from config import settings
+from crawlers import AsyncNiceCrawler, NiceCrawler
 from dispatcher import CrawlerDispatcher
 
+from core.db.documents import NiceDocument
+
 logger = Logger(service="pharmassist/crawler")
 
+# Unique url index, so the existence checks of the crawlers are index lookups
+NiceDocument.ensure_indexes()
+
 _dispatcher = CrawlerDispatcher()
-_dispatcher.register("nice", NiceCrawler)
+_dispatcher.register(
+    "nice", AsyncNiceCrawler if settings.CRAWLER_BACKEND == "http" else NiceCrawler
+)
 
 
 def handler(event, context: LambdaContext | None = None) -> dict[str, Any]:
-    for record in event.get("Records", []):
+    """
+    Crawl every SQS record of the event. The browser stays warm across records and invocations.
+
+    Failed records are reported as batchItemFailures, so with ReportBatchItemFailures enabled
+    only those messages are retried instead of the whole batch.
+    """
+    failures = []
+    records = event.get("Records", [])
+
+    for record in records:
         link = record.get("body")
-        crawler = _dispatcher.get_crawler(link)
 
         try:
+            crawler = _dispatcher.get_crawler(link)
             crawler.extract(link=link)
-        except Exception as e:
-            return {"statusCode": 500, "body": f"An error occurred: {str(e)}"}
-    return {"statusCode": 200, "body": "Link processed successfully"}
+        except Exception:
+            logger.exception(f"Failed to crawl {link}")
+            failures.append({"itemIdentifier": record.get("messageId", link)})
+
+    if failures:
+        return {
+            "statusCode": 500,
+            "body": f"{len(failures)} of {len(records)} link(s) failed",
+            "batchItemFailures": failures,
+        }
+
+    return {
+        "statusCode": 200,
+        "body": "Link processed successfully",
+        "batchItemFailures": [],
+    }
 
 
 if __name__ == "__main__":
@@ -15,6 +15,15 @@ class Settings(BaseSettings):
     EMBEDDING_SIZE: int = 384
     EMBEDDING_MODEL_DEVICE: str = "cuda"
 
+    # Embedding batching config (chunks are collected per document before embedding)
+    EMBEDDING_BATCH_SIZE: int = 32
+    EMBEDDING_BATCH_TIMEOUT_MS: int = 500
+
+    # Process pool for the cleaning and chunking stages (0 runs them in the Bytewax worker)
+    PROCESS_POOL_WORKERS: int = 0
+    # Documents with fewer chapters are processed in-process
+    PROCESS_POOL_MIN_ITEMS: int = 4
+
     # BM25 Sparse Embeddings config (for FastEmbed BM25)
     BM25_MODEL_ID: str = "Qdrant/bm25"
 
@@ -28,6 +37,14 @@ class Settings(BaseSettings):
     RABBITMQ_HOST: str = "mq"  # or localhost if running outside Docker
     RABBITMQ_PORT: int = 5672
     RABBITMQ_QUEUE_NAME: str = "default"
+    # Competing consumers per queue, spread across the Bytewax workers
+    RABBITMQ_NUM_PARTITIONS: int = 1
+    RABBITMQ_PREFETCH_COUNT: int = 64
+    RABBITMQ_BATCH_SIZE: int = 32  # max messages returned by a single next_batch call
+    # Delay before polling an empty queue again, without blocking the Bytewax worker
+    RABBITMQ_POLL_TIMEOUT_SECONDS: float = 1.0
+    # If False, messages are acked as soon as they enter the dataflow
+    RABBITMQ_ACK_ON_SNAPSHOT: bool = True
 
     # QdrantDB config
     QDRANT_DATABASE_HOST: str = "qdrant"  # or localhost if running outside Docker
@@ -35,6 +52,8 @@ class Settings(BaseSettings):
     USE_QDRANT_CLOUD: bool = True  # if True, fill in QDRANT_CLOUD_URL and QDRANT_APIKEY
     QDRANT_CLOUD_URL: str | None = None
     QDRANT_APIKEY: str | None = None
+    QDRANT_UPSERT_BATCH_SIZE: int = 64
+    QDRANT_UPSERT_PARALLELISM: int = 4
 
 
 settings = Settings()
@@ -0,0 +1,108 @@
+import uuid
+
+from models.base import DataModel
+from models.chunk import NiceChunkModel
+from qdrant_client import models
+
+from core import get_logger
+from core.db.qdrant import QdrantDatabaseConnector
+from data_flow.stream_output import get_vector_collection
+
+logger = get_logger(__name__)
+
+
+class QdrantChunkDiff:
+    """
+    Compares the chunks of a document against the points already stored for its entry in Qdrant.
+
+    Chunk ids are the md5 of the chunk content, so a chunk whose id is already stored doesn't need to be
+    embedded again. Stored chunks that disappeared from the document are deleted, unchanged ones only get
+    their document level payload (title, url, last_updated) refreshed, and only new chunks are returned.
+    """
+
+    document_fields = ("title", "url", "last_updated")
+
+    def __init__(self, connection: QdrantDatabaseConnector):
+        self._client = connection
+
+    def diff(
+        self, document_chunks: tuple[DataModel, list[NiceChunkModel]]
+    ) -> list[NiceChunkModel]:
+        """
+        Takes a raw document with all its chunks. A document left without any chunk still has
+        its stored points deleted.
+        """
+        document, chunks = document_chunks
+
+        return self._diff_entry(
+            collection_name=get_vector_collection(document.type),
+            document=document,
+            chunks=chunks,
+        )
+
+    def _diff_entry(
+        self, collection_name: str, document: DataModel, chunks: list[NiceChunkModel]
+    ) -> list[NiceChunkModel]:
+        entry_id = document.entry_id
+        entry_filter = models.Filter(
+            must=[
+                models.FieldCondition(key="id", match=models.MatchValue(value=entry_id))
+            ]
+        )
+        existing_points = {
+            normalize_point_id(point.id): point
+            for point in self._client.scroll_all(
+                collection_name=collection_name,
+                scroll_filter=entry_filter,
+                with_payload=list(self.document_fields),
+            )
+        }
+        current_chunks = {normalize_point_id(chunk.chunk_id): chunk for chunk in chunks}
+
+        stale_ids = [
+            existing_points[point_id].id
+            for point_id in existing_points.keys() - current_chunks.keys()
+        ]
+        if stale_ids:
+            self._client.delete_points(collection_name=collection_name, ids=stale_ids)
+
+        unchanged_ids = existing_points.keys() & current_chunks.keys()
+        document_payload = {
+            field: getattr(document, field) for field in self.document_fields
+        }
+        payload_changed = any(
+            existing_points[point_id].payload != document_payload
+            for point_id in unchanged_ids
+        )
+        if payload_changed:
+            self._client.set_payload(
+                collection_name=collection_name,
+                payload=document_payload,
+                points_filter=entry_filter,
+            )
+
+        # New chunks bump the version when the vector sink writes them
+        if stale_ids or payload_changed:
+            self._client.set_collection_version(collection_name)
+
+        new_chunks = [
+            chunk
+            for point_id, chunk in current_chunks.items()
+            if point_id not in existing_points
+        ]
+
+        logger.info(
+            "Compared chunks with the stored points.",
+            collection_name=collection_name,
+            entry_id=entry_id,
+            num_new=len(new_chunks),
+            num_unchanged=len(unchanged_ids),
+            num_deleted=len(stale_ids),
+        )
+
+        return new_chunks
+
+
+def normalize_point_id(point_id: str) -> str:
+    """Qdrant returns UUID ids in their hyphenated form, while chunk ids are plain md5 hex digests."""
+    return uuid.UUID(str(point_id)).hex
@@ -1,75 +1,191 @@
 import json
-import time
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timedelta, timezone
 from typing import Generic, Iterable, List, Optional, TypeVar
 
 from bytewax.inputs import FixedPartitionedSource, StatefulSourcePartition
 from config import settings
 
 from core import get_logger
-from core.mq import RabbitMQConnection
+from core.mq import create_connection
 
 logger = get_logger(__name__)
 
 DataT = TypeVar("DataT")
 MessageT = TypeVar("MessageT")
 
+# Delay before reconnecting after a connection error
+RECONNECT_DELAY = timedelta(seconds=10)
+
 
 class RabbitMQPartition(StatefulSourcePartition, Generic[DataT, MessageT]):
     """
     Class responsible for creating a connection between bytewax and rabbitmq that facilitates the transfer of data from mq to bytewax streaming piepline.
     Inherits StatefulSourcePartition for snapshot functionality that enables saving the state of the queue
+
+    Messages are pushed by the broker through a consumer (basic_consume) into a local buffer, bounded by the
+    QoS prefetch window, and each call to next_batch drains up to batch_size of them. next_batch never
+    blocks the worker: when the queue is empty, the next poll is scheduled poll_timeout later through next_awake.
+
+    With ack_on_snapshot, messages are acked manually one epoch after they entered the dataflow: the
+    snapshot that closes epoch N acks everything emitted during epoch N - 1, which has been processed
+    by the downstream steps by then. Anything not acked when the process dies (or the channel drops)
+    is redelivered by the broker, which gives at-least-once delivery. Delivery tags are scoped to a
+    channel, so there is nothing to resume from and the snapshot state is always None.
     """
 
-    def __init__(self, queue_name: str, resume_state: MessageT | None = None) -> None:
-        self._in_flight_msg_ids = resume_state or set()
+    def __init__(
+        self,
+        queue_name: str,
+        consumer_tag: str | None = None,
+        batch_size: int = settings.RABBITMQ_BATCH_SIZE,
+        prefetch_count: int = settings.RABBITMQ_PREFETCH_COUNT,
+        poll_timeout: float = settings.RABBITMQ_POLL_TIMEOUT_SECONDS,
+        ack_on_snapshot: bool = settings.RABBITMQ_ACK_ON_SNAPSHOT,
+    ) -> None:
         self.queue_name = queue_name
-        self.connection = RabbitMQConnection()
-        self.connection.connect()
-        self.channel = self.connection.get_channel()
+        self.consumer_tag = consumer_tag
+        self.batch_size = batch_size
+        self.prefetch_count = prefetch_count
+        self.poll_timeout = poll_timeout
+        self.ack_on_snapshot = ack_on_snapshot
+        self._awake_at: datetime | None = None
+
+        self._connect()
+
+    def _connect(self) -> None:
+        # Unacked messages of a previous channel are requeued by the broker, so the local state is reset.
+        self._buffer: deque[tuple[int, bytes]] = deque()
+        self._last_emitted_tag: int | None = None
+        self._pending_ack_tag: int | None = None
+
+        # Each partition owns its connection: pika connections can't be shared across worker threads.
+        self.connection = create_connection()
+        self.channel = self.connection.channel()
+        self.channel.queue_declare(queue=self.queue_name, durable=True)
+        self.channel.basic_qos(prefetch_count=self.prefetch_count)
+        self.channel.basic_consume(
+            queue=self.queue_name,
+            on_message_callback=self._on_message,
+            consumer_tag=self.consumer_tag,
+        )
+
+    def _on_message(self, channel, method_frame, header_frame, body) -> None:
+        if method_frame.redelivered:
+            logger.info(
+                "Received redelivered message.",
+                queue_name=self.queue_name,
+                delivery_tag=method_frame.delivery_tag,
+            )
+
+        self._buffer.append((method_frame.delivery_tag, body))
 
     def next_batch(self, sched: Optional[datetime] = None) -> Iterable[DataT]:
         try:
-            method_frame, header_frame, body = self.channel.basic_get(
-                queue=self.queue_name, auto_ack=True
-            )
+            if self.connection is None:
+                self._connect()
+            if not self._buffer:
+                # Only handle the deliveries already received, the idle backoff goes through next_awake
+                self.connection.process_data_events(time_limit=0)
         except Exception:
-            logger.error(
+            logger.exception(
                 "Error while fetching message from queue.", queue_name=self.queue_name
             )
-            time.sleep(10)  # Sleep for 10 seconds before retrying to access the queue.
-
-            self.connection.connect()
-            self.channel = self.connection.get_channel()
+            self._disconnect()
+            self._awake_at = datetime.now(timezone.utc) + RECONNECT_DELAY
 
             return []
 
-        if method_frame:
-            message_id = method_frame.delivery_tag
-            self._in_flight_msg_ids.add(message_id)
+        batch = []
+        while self._buffer and len(batch) < self.batch_size:
+            delivery_tag, body = self._buffer.popleft()
+            self._last_emitted_tag = delivery_tag
+            batch.append(json.loads(body))
 
-            return [json.loads(body)]
-        else:
-            return []
+        if batch and not self.ack_on_snapshot:
+            self._ack(self._last_emitted_tag)
+
+        self._awake_at = (
+            None
+            if batch
+            else datetime.now(timezone.utc) + timedelta(seconds=self.poll_timeout)
+        )
+
+        return batch
+
+    def next_awake(self) -> Optional[datetime]:
+        return self._awake_at
 
     def snapshot(self) -> MessageT:
-        return self._in_flight_msg_ids
+        if self.ack_on_snapshot:
+            self._ack(self._pending_ack_tag)
+            self._pending_ack_tag = self._last_emitted_tag
+
+        return None
+
+    def _ack(self, delivery_tag: int | None) -> None:
+        # The deliveries of a closed channel are requeued by the broker, they can't be acked anymore
+        if delivery_tag is None or self.channel is None:
+            return
 
-    def garbage_collect(self, state):
-        closed_in_flight_msg_ids = state
-        for msg_id in closed_in_flight_msg_ids:
-            self.channel.basic_ack(delivery_tag=msg_id)
-            self._in_flight_msg_ids.remove(msg_id)
+        try:
+            # Tags are handed out in order, so one ack confirms every earlier message as well.
+            self.channel.basic_ack(delivery_tag=delivery_tag, multiple=True)
+        except Exception:
+            logger.exception(
+                "Failed to ack messages. They will be redelivered.",
+                queue_name=self.queue_name,
+                delivery_tag=delivery_tag,
+            )
+
+            return
+
+        if self._pending_ack_tag == delivery_tag:
+            self._pending_ack_tag = None
+        if self._last_emitted_tag == delivery_tag:
+            self._last_emitted_tag = None
+
+    def _disconnect(self) -> None:
+        """Close the connection, if still open, so its unacked deliveries are requeued right away."""
+        connection, self.connection, self.channel = self.connection, None, None
+        if connection is None:
+            return
+
+        try:
+            connection.close()
+        except Exception:
+            # The connection is usually already broken at this point
+            logger.debug("Error while closing the connection.", exc_info=True)
 
     def close(self):
-        self.channel.close()
+        # Buffered and unacked messages go back to the queue when the channel closes.
+        if self.channel is not None:
+            self.channel.close()
+        self._disconnect()
 
 
 class RabbitMQSource(FixedPartitionedSource):
+    """
+    Exposes num_partitions competing consumers per queue, so the partitions can be spread across Bytewax workers.
+    """
+
+    def __init__(
+        self,
+        queue_names: list[str] | None = None,
+        num_partitions: int = settings.RABBITMQ_NUM_PARTITIONS,
+    ) -> None:
+        self._partitions = {
+            f"{queue_name}-{index}": queue_name
+            for queue_name in queue_names or [settings.RABBITMQ_QUEUE_NAME]
+            for index in range(num_partitions)
+        }
+
     def list_parts(self) -> List[str]:
-        return ["single partition"]
+        return list(self._partitions)
 
     def build_part(
         self, now: datetime, for_part: str, resume_state: MessageT | None = None
     ) -> StatefulSourcePartition[DataT, MessageT]:
-        return RabbitMQPartition(queue_name=settings.RABBITMQ_QUEUE_NAME)
+        return RabbitMQPartition(
+            queue_name=self._partitions[for_part], consumer_tag=for_part
+        )
@@ -1,9 +1,14 @@
+from collections import defaultdict
+from typing import Callable
+
+import numpy as np
 from bytewax.outputs import DynamicSink, StatelessSinkPartition
+from config import settings
 from models.base import VectorDBDataModel
-from qdrant_client.models import Batch, PointIdsList
+from qdrant_client import models
 
 from core import get_logger
-from core.db.qdrant import QdrantDatabaseConnector
+from core.db.qdrant import COLLECTION_VERSIONS, QdrantDatabaseConnector
 
 logger = get_logger(__name__)
 
@@ -23,6 +28,7 @@ class QdrantOutput(DynamicSink):
             "vector_nice": True,
             "cleaned_test": False,
             "vector_test": True,
+            COLLECTION_VERSIONS: False,
         }
 
         for collection_name, is_vector in collections.items():
@@ -43,6 +49,15 @@ class QdrantOutput(DynamicSink):
                         collection_name=collection_name
                     )
 
+            if collection_name == COLLECTION_VERSIONS:
+                continue
+
+            # Entry ids are used to delete stale points in bulk, which needs a payload index to be cheap
+            self._connection.create_keyword_index(
+                collection_name=collection_name,
+                field_name="id" if is_vector else "entry_id",
+            )
+
     def build(
         self, step_id: str, worker_index: int, worker_count: int
     ) -> StatelessSinkPartition:
@@ -60,42 +75,41 @@ class QdrantCleanedDataSink(StatelessSinkPartition):
 
     def write_batch(self, items: list[VectorDBDataModel]) -> None:
         payloads = [item.to_payload() for item in items]
-        ids, data = zip(*payloads)
-        collection_name = get_clean_collection(data_type=data[0]["type"])
-        entry_id = data[0]["entry_id"]
-
-        # Find and delete existing vectors by id in metadata
-        existing_points = self._client._instance.scroll(
-            collection_name=collection_name,
-            scroll_filter={"must": [{"key": "entry_id", "match": {"value": entry_id}}]},
-            limit=10000,
-        )[0]
-
-        if existing_points:
-            qdrant_ids = [point.id for point in existing_points]
-            self._client._instance.delete(
+
+        for collection_name, collection_payloads in group_by_collection(
+            payloads,
+            get_collection=lambda payload: get_clean_collection(payload[1]["type"]),
+        ).items():
+            ids, data = map(list, zip(*collection_payloads))
+            entry_versions = {
+                payload["entry_id"]: payload["last_updated"] for payload in data
+            }
+
+            # Delete the points of older versions of every entry in the batch in a single request
+            self._client.delete_by_filter(
                 collection_name=collection_name,
-                points_selector=PointIdsList(points=qdrant_ids),
+                points_filter=build_stale_entries_filter(
+                    entry_key="entry_id", entry_versions=entry_versions
+                ),
+                wait=False,
             )
-            logger.info(
-                "Deleted cleaned data",
+
+            # Insert new points
+            self._client.write_data_batched(
                 collection_name=collection_name,
-                num=len(qdrant_ids),
-                entry_id=entry_id,
+                ids=ids,
+                vectors={},
+                payloads=data,
+                batch_size=settings.QDRANT_UPSERT_BATCH_SIZE,
+                parallelism=settings.QDRANT_UPSERT_PARALLELISM,
             )
 
-        # Insert new points
-        self._client.write_data(
-            collection_name=collection_name,
-            points=Batch(ids=ids, vectors={}, payloads=data),
-        )
-
-        logger.info(
-            "Successfully inserted cleaned data",
-            collection_name=collection_name,
-            num=len(ids),
-            entry_id=entry_id,
-        )
+            logger.info(
+                "Successfully inserted cleaned data",
+                collection_name=collection_name,
+                num=len(ids),
+                num_entries=len(entry_versions),
+            )
 
 
 class QdrantVectorDataSink(StatelessSinkPartition):
@@ -104,46 +118,75 @@ class QdrantVectorDataSink(StatelessSinkPartition):
 
     def write_batch(self, items: list[VectorDBDataModel]) -> None:
         payloads = [item.to_payload() for item in items]
-        ids, dense_vectors, sparse_vectors, meta_data = zip(*payloads)
-        collection_name = get_vector_collection(data_type=meta_data[0]["type"])
-        match_id = meta_data[0]["id"]
-
-        # Find and delete existing vectors by id in metadata
-        existing_points = self._client._instance.scroll(
-            collection_name=collection_name,
-            scroll_filter={"must": [{"key": "id", "match": {"value": match_id}}]},
-            limit=10000,
-        )[0]
-
-        if existing_points:
-            qdrant_ids = [point.id for point in existing_points]
-            self._client._instance.delete(
+
+        for collection_name, collection_payloads in group_by_collection(
+            payloads,
+            get_collection=lambda payload: get_vector_collection(payload[3]["type"]),
+        ).items():
+            ids, dense_vectors, sparse_vectors, meta_data = map(
+                list, zip(*collection_payloads)
+            )
+            # Insert new points (stale ones were already deleted by QdrantChunkDiff)
+            self._client.write_data_batched(
                 collection_name=collection_name,
-                points_selector=PointIdsList(points=qdrant_ids),
+                ids=ids,
+                vectors={"dense": np.stack(dense_vectors), "sparse": sparse_vectors},
+                payloads=meta_data,
+                batch_size=settings.QDRANT_UPSERT_BATCH_SIZE,
+                parallelism=settings.QDRANT_UPSERT_PARALLELISM,
             )
+            # Invalidates the answers cached by the inference pipeline
+            self._client.set_collection_version(collection_name)
+
             logger.info(
-                "Deleted existing vector point(s)",
+                "Successfully inserted vector point(s)",
                 collection_name=collection_name,
-                num=len(qdrant_ids),
-                id=match_id,
+                num=len(ids),
+                num_entries=len({data["id"] for data in meta_data}),
             )
 
-        # Insert new points
-        self._client.write_data(
-            collection_name=collection_name,
-            points=Batch(
-                ids=ids,
-                vectors={"dense": dense_vectors, "sparse": sparse_vectors},
-                payloads=meta_data,
-            ),
-        )
-
-        logger.info(
-            "Successfully inserted vector point(s)",
-            collection_name=collection_name,
-            num=len(ids),
-            id=match_id,
-        )
+
+def group_by_collection(
+    payloads: list[tuple], get_collection: Callable[[tuple], str]
+) -> dict[str, list[tuple]]:
+    grouped = defaultdict(list)
+    for payload in payloads:
+        grouped[get_collection(payload)].append(payload)
+
+    return grouped
+
+
+def build_stale_entries_filter(
+    entry_key: str, entry_versions: dict[str, str]
+) -> models.Filter:
+    """
+    Match the points of the given entries whose version differs from the one being written.
+
+    Points already written for the current version are kept, so a document split across several
+    batches is never deleted by its own later batches.
+    """
+    return models.Filter(
+        must=[
+            models.FieldCondition(
+                key=entry_key, match=models.MatchAny(any=list(entry_versions))
+            )
+        ],
+        should=[
+            models.Filter(
+                must=[
+                    models.FieldCondition(
+                        key=entry_key, match=models.MatchValue(value=entry_id)
+                    )
+                ],
+                must_not=[
+                    models.FieldCondition(
+                        key="last_updated", match=models.MatchValue(value=version)
+                    )
+                ],
+            )
+            for entry_id, version in entry_versions.items()
+        ],
+    )
 
 
 def get_clean_collection(data_type: str) -> str:
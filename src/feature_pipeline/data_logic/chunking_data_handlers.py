@@ -4,7 +4,8 @@ from abc import ABC, abstractmethod
 from models.base import DataModel
 from models.chunk import NiceChunkModel
 from models.clean import NiceCleanedModel
-from utils.chunking import chunk_text
+from utils.chunking import chunk_texts
+from utils.parallel import map_batches
 
 
 class ChunkingDataHandler(ABC):
@@ -17,26 +18,39 @@ class ChunkingDataHandler(ABC):
     def chunk(self, data_model: DataModel) -> list[DataModel]:
         pass
 
+    def chunk_batch(self, data_models: list[DataModel]) -> list[DataModel]:
+        """Chunks several data models. Handlers should override this to chunk the texts in one pass."""
+        chunk_models = []
+        for data_model in data_models:
+            chunk_models.extend(self.chunk(data_model))
+
+        return chunk_models
+
 
 class NiceChunkingHandler(ChunkingDataHandler):
     def chunk(self, data_model: NiceCleanedModel) -> list[NiceChunkModel]:
+        return self.chunk_batch([data_model])
+
+    def chunk_batch(self, data_models: list[NiceCleanedModel]) -> list[NiceChunkModel]:
         data_models_list = []
 
-        text_content = data_model.cleaned_content
-        chunks = chunk_text(text_content)
-
-        for chunk in chunks:
-            model = NiceChunkModel(
-                id=data_model.id,
-                entry_id=data_model.entry_id,
-                chunk_id=hashlib.md5(chunk.encode()).hexdigest(),
-                title=data_model.title,
-                chapter=data_model.chapter,
-                url=data_model.url,
-                last_updated=data_model.last_updated,
-                chunk_content=chunk,
-                type=data_model.type,
-            )
-            data_models_list.append(model)
+        chunks_per_model = map_batches(
+            chunk_texts, [data_model.cleaned_content for data_model in data_models]
+        )
+
+        for data_model, chunks in zip(data_models, chunks_per_model):
+            for chunk in chunks:
+                model = NiceChunkModel(
+                    id=data_model.id,
+                    entry_id=data_model.entry_id,
+                    chunk_id=hashlib.md5(chunk.encode()).hexdigest(),
+                    title=data_model.title,
+                    chapter=data_model.chapter,
+                    url=data_model.url,
+                    last_updated=data_model.last_updated,
+                    chunk_content=chunk,
+                    type=data_model.type,
+                )
+                data_models_list.append(model)
 
         return data_models_list
@@ -1,10 +1,12 @@
+import uuid
 from abc import ABC, abstractmethod
 from typing import List
 
 from models.base import DataModel
 from models.clean import NiceCleanedModel
 from models.raw import NiceRawModel
-from utils.cleaning import clean_text
+from utils.cleaning import clean_texts
+from utils.parallel import map_batches
 
 
 class CleaningDataHandler(ABC):
@@ -23,13 +25,29 @@ class NiceCleaningHandler(CleaningDataHandler):
         cleaned_models = []
 
         if data_model and data_model.chapters:
-            for chapter in data_model.chapters:
-                cleaned_text = ""
-                if chapter and "markdown" in chapter and chapter["markdown"]:
-                    cleaned_text = clean_text(chapter["markdown"])
-
+            # Chapters are cleaned across the process pool (if enabled), results keep the chapter order
+            cleaned_texts = map_batches(
+                clean_texts,
+                [
+                    chapter["markdown"]
+                    if chapter and "markdown" in chapter and chapter["markdown"]
+                    else ""
+                    for chapter in data_model.chapters
+                ],
+            )
+
+            for index, (chapter, cleaned_text) in enumerate(
+                zip(data_model.chapters, cleaned_texts)
+            ):
                 # Create a new NiceCleanedModel for each chapter
+                # Deterministic ids make re-ingesting the same version overwrite the existing points
                 chapter_model = NiceCleanedModel(
+                    id=str(
+                        uuid.uuid5(
+                            uuid.NAMESPACE_URL,
+                            f"{data_model.entry_id}/{index}/{chapter['title']}",
+                        )
+                    ),
                     entry_id=data_model.entry_id,
                     title=data_model.title,
                     url=data_model.url,
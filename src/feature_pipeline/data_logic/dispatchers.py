@@ -92,6 +92,25 @@ class ChunkingDispatcher:
 
         return chunk_models
 
+    @classmethod
+    def dispatch_document_chunker(cls, data_models: list[DataModel]) -> list[DataModel]:
+        """Chunk all the cleaned chapters of a document in one pass, keeping its chunks together."""
+        if not data_models:
+            return []
+
+        data_type = data_models[0].type
+        handler = cls.chunking_factory.create_handler(data_type)
+        chunk_models = handler.chunk_batch(data_models)
+
+        logger.info(
+            "Cleaned document chunked successfully.",
+            num=len(chunk_models),
+            num_chapters=len(data_models),
+            data_type=data_type,
+        )
+
+        return chunk_models
+
 
 class EmbeddingHandlerFactory:
     @staticmethod
@@ -123,3 +142,23 @@ class EmbeddingDispatcher:
         )
 
         return embedded_chunk_model
+
+    @classmethod
+    def dispatch_batch_embedder(cls, data_models: list[DataModel]) -> list[DataModel]:
+        embedded_chunk_models = []
+
+        data_types = dict.fromkeys(data_model.type for data_model in data_models)
+        for data_type in data_types:
+            handler = cls.embedding_factory.create_handler(data_type)
+            batch = [
+                data_model for data_model in data_models if data_model.type == data_type
+            ]
+            embedded_chunk_models.extend(handler.embedd_batch(batch))
+
+            logger.info(
+                "Chunk batch embedded successfully.",
+                data_type=data_type,
+                num=len(batch),
+            )
+
+        return embedded_chunk_models
@@ -3,7 +3,7 @@ from abc import ABC, abstractmethod
 from models.base import DataModel
 from models.chunk import NiceChunkModel
 from models.embedded_chunk import NiceEmbeddedChunkModel
-from utils.embeddings import embedd_text
+from utils.embeddings import embedd_text, embedd_texts
 
 
 class EmbeddingDataHandler(ABC):
@@ -16,6 +16,10 @@ class EmbeddingDataHandler(ABC):
     def embedd(self, data_model: DataModel) -> DataModel:
         pass
 
+    def embedd_batch(self, data_models: list[DataModel]) -> list[DataModel]:
+        """Embeds a batch of data models. Handlers should override this to call the models on lists."""
+        return [self.embedd(data_model) for data_model in data_models]
+
 
 class NiceEmbeddingHandler(EmbeddingDataHandler):
     def embedd(self, data_model: NiceChunkModel) -> NiceEmbeddedChunkModel:
@@ -32,3 +36,29 @@ class NiceEmbeddingHandler(EmbeddingDataHandler):
             sparse_embedded_content=embedd_text(data_model.chunk_content, sparse=True),
             type=data_model.type,
         )
+
+    def embedd_batch(
+        self, data_models: list[NiceChunkModel]
+    ) -> list[NiceEmbeddedChunkModel]:
+        texts = [data_model.chunk_content for data_model in data_models]
+        dense_embeddings = embedd_texts(texts)
+        sparse_embeddings = embedd_texts(texts, sparse=True)
+
+        return [
+            NiceEmbeddedChunkModel(
+                id=data_model.id,
+                entry_id=data_model.entry_id,
+                chunk_id=data_model.chunk_id,
+                title=data_model.title,
+                chapter=data_model.chapter,
+                url=data_model.url,
+                last_updated=data_model.last_updated,
+                chunk_content=data_model.chunk_content,
+                dense_embedded_content=dense_embedding,
+                sparse_embedded_content=sparse_embedding,
+                type=data_model.type,
+            )
+            for data_model, dense_embedding, sparse_embedding in zip(
+                data_models, dense_embeddings, sparse_embeddings
+            )
+        ]
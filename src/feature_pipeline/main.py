@@ -1,11 +1,14 @@
 import os
 import sys
+from datetime import timedelta
 
 # Add the project root to path to resolve module imports
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 
 import bytewax.operators as op
 from bytewax.dataflow import Dataflow
+from config import settings
+from data_flow.chunk_diff import QdrantChunkDiff
 from data_flow.stream_input import RabbitMQSource
 from data_flow.stream_output import QdrantOutput
 from data_logic.dispatchers import (
@@ -18,20 +21,47 @@ from data_logic.dispatchers import (
 from core.db.qdrant import QdrantDatabaseConnector
 
 connection = QdrantDatabaseConnector()
+chunk_diff = QdrantChunkDiff(connection=connection)
+
+
+def embed_chunk_batch(keyed_batch: tuple[str, list]) -> list:
+    _, chunks = keyed_batch
+
+    return EmbeddingDispatcher.dispatch_batch_embedder(chunks)
+
 
 flow = Dataflow("Streaming ingestion pipeline")
 stream = op.input("input", flow, RabbitMQSource())
 stream = op.map("raw dispatch", stream, RawDispatcher.handle_mq_message)
-stream = op.flat_map("clean dispatch", stream, CleaningDispatcher.dispatch_cleaner)
+# The chapters and chunks of a document travel together with the document, so they can be compared
+# with what is stored (even when the document no longer has any chunk)
+stream = op.map(
+    "clean dispatch",
+    stream,
+    lambda document: (document, CleaningDispatcher.dispatch_cleaner(document)),
+)
 op.output(
     "cleaned data insert to qdrant",
-    stream,
+    op.flat_map("flatten cleaned chapters", stream, lambda item: item[1]),
     QdrantOutput(connection=connection, sink_type="clean"),
 )
-stream = op.flat_map("chunk dispatch", stream, ChunkingDispatcher.dispatch_chunker)
 stream = op.map(
-    "embedded chunk dispatch", stream, EmbeddingDispatcher.dispatch_embedder
+    "chunk dispatch",
+    stream,
+    lambda item: (item[0], ChunkingDispatcher.dispatch_document_chunker(item[1])),
+)
+# Only chunks that are not stored yet are embedded, stale ones are deleted
+stream = op.flat_map("chunk diff", stream, chunk_diff.diff)
+# Chunks are grouped per document and embedded in batches, so the embedding models
+# run on lists instead of one string at a time.
+keyed_stream = op.key_on("key chunks by entry", stream, lambda chunk: chunk.entry_id)
+batched_stream = op.collect(
+    "collect chunk batches",
+    keyed_stream,
+    timeout=timedelta(milliseconds=settings.EMBEDDING_BATCH_TIMEOUT_MS),
+    max_size=settings.EMBEDDING_BATCH_SIZE,
 )
+stream = op.flat_map("embedded chunk dispatch", batched_stream, embed_chunk_batch)
 op.output(
     "embedded data insert to qdrant",
     stream,
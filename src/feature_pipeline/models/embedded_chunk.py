@@ -1,6 +1,7 @@
 from typing import Tuple
 
 import numpy as np
+from pydantic import field_validator
 
 from models.base import VectorDBDataModel
 
@@ -9,7 +10,7 @@ class NiceEmbeddedChunkModel(VectorDBDataModel):
     entry_id: str
     chunk_id: str
     chunk_content: str
-    dense_embedded_content: list[float]
+    dense_embedded_content: np.ndarray
     sparse_embedded_content: dict
     title: str
     chapter: str
@@ -20,6 +21,12 @@ class NiceEmbeddedChunkModel(VectorDBDataModel):
     class Config:
         arbitrary_types_allowed = True
 
+    @field_validator("dense_embedded_content", mode="before")
+    @classmethod
+    def as_float32_array(cls, value) -> np.ndarray:
+        # Keep the raw float32 buffer instead of validating one Python float at a time
+        return np.ascontiguousarray(value, dtype=np.float32)
+
     def to_payload(self) -> Tuple[str, np.ndarray, dict, dict]:
         data = {
             "id": self.entry_id,
@@ -1,34 +1,93 @@
+from functools import lru_cache
+
 from config import settings
 from langchain.text_splitter import (
     RecursiveCharacterTextSplitter,
     SentenceTransformersTokenTextSplitter,
+    Tokenizer,
+    split_text_on_tokens,
 )
 
+from core.lib import flatten
+
+TOKEN_CHUNK_OVERLAP = 50
+
+
+@lru_cache(maxsize=1)
+def get_character_splitter() -> RecursiveCharacterTextSplitter:
+    return RecursiveCharacterTextSplitter(
+        separators=["\n\n"], chunk_size=500, chunk_overlap=0
+    )
+
+
+@lru_cache(maxsize=1)
+def get_token_splitter() -> SentenceTransformersTokenTextSplitter:
+    # Loads the SentenceTransformer model from disk, so it is only built once per process
+    return SentenceTransformersTokenTextSplitter(
+        chunk_overlap=TOKEN_CHUNK_OVERLAP,
+        tokens_per_chunk=settings.EMBEDDING_MODEL_MAX_INPUT_LENGTH,
+        model_name=settings.EMBEDDING_MODEL_ID,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_tiktoken_splitter() -> RecursiveCharacterTextSplitter:
+    return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+        model_name=settings.EMBEDDING_MODEL_ID,
+        chunk_size=settings.EMBEDDING_MODEL_MAX_INPUT_LENGTH,
+        chunk_overlap=TOKEN_CHUNK_OVERLAP,
+    )
+
 
 def chunk_text(text: str) -> list[str]:
+    return chunk_texts([text])[0]
+
+
+def chunk_texts(texts: list[str]) -> list[list[str]]:
+    """Chunk several texts at once. Returns the chunks of every text, in the input order."""
     if settings.EMBEDDING_MODEL_PROVIDER == "huggingface":
-        character_splitter = RecursiveCharacterTextSplitter(
-            separators=["\n\n"], chunk_size=500, chunk_overlap=0
-        )
-        text_split = character_splitter.split_text(text)
-        token_splitter = SentenceTransformersTokenTextSplitter(
-            chunk_overlap=50,
-            tokens_per_chunk=settings.EMBEDDING_MODEL_MAX_INPUT_LENGTH,
-            model_name=settings.EMBEDDING_MODEL_ID,
-        )
-        chunks = []
+        character_splitter = get_character_splitter()
+        sections = [character_splitter.split_text(text) for text in texts]
 
-        for section in text_split:
-            chunks.extend(token_splitter.split_text(section))
+        token_ids = _tokenize_sections(flatten(sections))
+        token_splitter = get_token_splitter()
+
+        chunks = []
+        for text_sections in sections:
+            text_chunks = []
+            for _ in text_sections:
+                # Same token windows as token_splitter.split_text, on the pre-computed token ids
+                section_ids = next(token_ids)
+                text_chunks.extend(
+                    split_text_on_tokens(
+                        text="",
+                        tokenizer=Tokenizer(
+                            chunk_overlap=TOKEN_CHUNK_OVERLAP,
+                            tokens_per_chunk=token_splitter.tokens_per_chunk,
+                            decode=token_splitter.tokenizer.decode,
+                            encode=lambda _text: section_ids,
+                        ),
+                    )
+                )
+            chunks.append(text_chunks)
     elif settings.EMBEDDING_MODEL_PROVIDER == "openai":
-        text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
-            model_name=settings.EMBEDDING_MODEL_ID,
-            chunk_size=settings.EMBEDDING_MODEL_MAX_INPUT_LENGTH,
-            chunk_overlap=50,
-        )
-        chunks = text_splitter.split_text(text)
+        text_splitter = get_tiktoken_splitter()
+        chunks = [text_splitter.split_text(text) for text in texts]
     else:
         raise ValueError(
             f"Invalid embedding model provider: {settings.EMBEDDING_MODEL_PROVIDER}"
         )
     return chunks
+
+
+def _tokenize_sections(sections: list[str]):
+    """Tokenize all sections in one batched call, stripping the start and end tokens like the token splitter does."""
+    if not sections:
+        return iter([])
+
+    tokenizer = get_token_splitter().tokenizer
+    encoded = tokenizer(
+        sections, max_length=2**32, truncation="do_not_truncate", verbose=False
+    )
+
+    return (input_ids[1:-1] for input_ids in encoded["input_ids"])
@@ -1,110 +1,73 @@
 import re
 
-from unstructured.cleaners.core import (
-    clean,
-    clean_non_ascii_chars,
-    replace_unicode_quotes,
-)
-
+from unstructured.cleaners.core import replace_unicode_quotes
 
-def unbold_text(text):
-    # Mapping of bold numbers to their regular equivalents
-    bold_numbers = {
-        "𝟬": "0",
-        "𝟭": "1",
-        "𝟮": "2",
-        "𝟯": "3",
-        "𝟰": "4",
-        "𝟱": "5",
-        "𝟲": "6",
-        "𝟳": "7",
-        "𝟴": "8",
-        "𝟵": "9",
-    }
-
-    # Function to convert bold characters (letters and numbers)
-    def convert_bold_char(match):
-        char = match.group(0)
-        # Convert bold numbers
-        if char in bold_numbers:
-            return bold_numbers[char]
-        # Convert bold uppercase letters
-        elif "\U0001d5d4" <= char <= "\U0001d5ed":
-            return chr(ord(char) - 0x1D5D4 + ord("A"))
-        # Convert bold lowercase letters
-        elif "\U0001d5ee" <= char <= "\U0001d607":
-            return chr(ord(char) - 0x1D5EE + ord("a"))
-        else:
-            return char  # Return the character unchanged if it's not a bold number or letter
-
-    # Regex for bold characters (numbers, uppercase, and lowercase letters)
-    bold_pattern = re.compile(
-        r"[\U0001D5D4-\U0001D5ED\U0001D5EE-\U0001D607\U0001D7CE-\U0001D7FF]"
-    )
-    text = bold_pattern.sub(convert_bold_char, text)
 
+def remove_non_ascii(text: str) -> str:
+    text = text.encode("ascii", "ignore").decode("ascii")
     return text
 
 
-def unitalic_text(text):
-    # Function to convert italic characters (both letters)
-    def convert_italic_char(match):
-        char = match.group(0)
-        # Unicode ranges for italic characters
-        if "\U0001d608" <= char <= "\U0001d621":  # Italic uppercase A-Z
-            return chr(ord(char) - 0x1D608 + ord("A"))
-        elif "\U0001d622" <= char <= "\U0001d63b":  # Italic lowercase a-z
-            return chr(ord(char) - 0x1D622 + ord("a"))
-        else:
-            return char  # Return the character unchanged if it's not an italic letter
+def build_math_alphanumeric_table() -> dict[int, str]:
+    """Translation table mapping the sans-serif bold/italic letters and bold digits to ASCII."""
+    table = {}
+    for start, first in (
+        (0x1D5D4, "A"),  # Bold uppercase A-Z
+        (0x1D5EE, "a"),  # Bold lowercase a-z
+        (0x1D608, "A"),  # Italic uppercase A-Z
+        (0x1D622, "a"),  # Italic lowercase a-z
+    ):
+        for offset in range(26):
+            table[start + offset] = chr(ord(first) + offset)
 
-    # Regex for italic characters (uppercase and lowercase letters)
-    italic_pattern = re.compile(r"[\U0001D608-\U0001D621\U0001D622-\U0001D63B]")
-    text = italic_pattern.sub(convert_italic_char, text)
+    # Only 𝟬-𝟵 are converted, the rest of the mathematical digits are left unchanged
+    for offset in range(10):
+        table[0x1D7EC + offset] = str(offset)
+
+    return table
 
-    return text
 
+MATH_ALPHANUMERIC_TABLE = build_math_alphanumeric_table()
 
-def remove_emojis_and_symbols(text):
-    # Extended pattern to include specific symbols like ↓ (U+2193) or ↳ (U+21B3)
-    emoji_and_symbol_pattern = re.compile(
-        "["
-        "\U0001f600-\U0001f64f"  # emoticons
-        "\U0001f300-\U0001f5ff"  # symbols & pictographs
-        "\U0001f680-\U0001f6ff"  # transport & map symbols
-        "\U0001f1e0-\U0001f1ff"  # flags (iOS)
-        "\U00002193"  # downwards arrow
-        "\U000021b3"  # downwards arrow with tip rightwards
-        "\U00002192"  # rightwards arrow
-        "]+",
-        flags=re.UNICODE,
-    )
+EMOJI_AND_SYMBOL_PATTERN = re.compile(
+    "["
+    "\U0001f600-\U0001f64f"  # emoticons
+    "\U0001f300-\U0001f5ff"  # symbols & pictographs
+    "\U0001f680-\U0001f6ff"  # transport & map symbols
+    "\U0001f1e0-\U0001f1ff"  # flags (iOS)
+    "\U00002192\U00002193\U000021b3"  # arrows
+    "]+"
+)
 
-    return emoji_and_symbol_pattern.sub(r" ", text)
+URL_PATTERN = re.compile(r"https?://\S+|www\.\S+")
 
 
-def replace_urls_with_placeholder(text, placeholder="[URL]"):
-    # Regular expression pattern for matching URLs
-    url_pattern = r"https?://\S+|www\.\S+"
+def clean_text(text_content: str | None) -> str:
+    """
+    Single-pass cleaner built on precompiled tables and patterns. It produces the same output as the
+    original multi-pass cleaner kept in checks/cleaning_reference.py.
 
-    return re.sub(url_pattern, placeholder, text)
+    The unicode-only steps are skipped for pure ASCII text, which is most of a NICE chapter.
+    """
+    if text_content is None:
+        return ""
 
+    is_ascii = text_content.isascii()
+    if is_ascii:
+        cleaned_text = text_content.strip()
+    else:
+        cleaned_text = text_content.translate(MATH_ALPHANUMERIC_TABLE)
+        cleaned_text = EMOJI_AND_SYMBOL_PATTERN.sub(" ", cleaned_text).strip()
 
-def remove_non_ascii(text: str) -> str:
-    text = text.encode("ascii", "ignore").decode("ascii")
-    return text
+    # replace_unicode_quotes only changes "&apos;" and non-ASCII sequences
+    if not is_ascii or "&apos;" in cleaned_text:
+        cleaned_text = replace_unicode_quotes(cleaned_text)
 
+    if not cleaned_text.isascii():
+        cleaned_text = remove_non_ascii(cleaned_text)
 
-def clean_text(text_content: str | None) -> str:
-    if text_content is None:
-        return ""
+    return URL_PATTERN.sub("[URL]", cleaned_text)
 
-    cleaned_text = unbold_text(text_content)
-    cleaned_text = unitalic_text(cleaned_text)
-    cleaned_text = remove_emojis_and_symbols(cleaned_text)
-    cleaned_text = clean(cleaned_text)
-    cleaned_text = replace_unicode_quotes(cleaned_text)
-    cleaned_text = clean_non_ascii_chars(cleaned_text)
-    cleaned_text = replace_urls_with_placeholder(cleaned_text)
 
-    return cleaned_text
+def clean_texts(texts: list[str | None]) -> list[str]:
+    return [clean_text(text) for text in texts]
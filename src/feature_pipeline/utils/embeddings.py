@@ -27,7 +27,31 @@ class EmbeddingModelManager:
         else:
             return self._dense_model.embed(text)
 
+    def encode_batch(self, texts: list[str], sparse: bool = False):
+        """
+        Embeds all texts with a single call to the underlying model.
+        Dense embeddings are returned as a 2-D float32 array, sparse ones as a list of objects.
+        """
+        if not texts:
+            return []
+
+        if sparse:
+            if self._sparse_model:
+                return [
+                    embedding.as_object()
+                    for embedding in self._sparse_model.embed(list(texts))
+                ]
+            else:
+                return [None] * len(texts)
+        else:
+            return self._dense_model.embed(list(texts))
+
 
 def embedd_text(text: str, sparse: bool = False):
     model_manager = EmbeddingModelManager()
     return model_manager.encode(text, sparse)
+
+
+def embedd_texts(texts: list[str], sparse: bool = False):
+    model_manager = EmbeddingModelManager()
+    return model_manager.encode_batch(texts, sparse)
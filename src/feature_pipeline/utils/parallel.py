@@ -0,0 +1,61 @@
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, TypeVar
+
+from config import settings
+
+from core import get_logger
+from core.lib import flatten
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def get_process_pool() -> ProcessPoolExecutor | None:
+    """Lazily create the process pool shared by the cleaning and chunking stages. Returns None if disabled."""
+    global _executor
+
+    if settings.PROCESS_POOL_WORKERS <= 0:
+        return None
+
+    if _executor is None:
+        # Spawn instead of fork: the Bytewax worker already runs threads (and possibly torch)
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PROCESS_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        atexit.register(_executor.shutdown, cancel_futures=True)
+
+        logger.info("Started process pool.", workers=settings.PROCESS_POOL_WORKERS)
+
+    return _executor
+
+
+def map_batches(batch_func: Callable[[list[T]], list[R]], items: list[T]) -> list[R]:
+    """
+    Apply a batch function over contiguous slices of items across the process pool.
+
+    batch_func must be a picklable module-level function returning one result per item.
+    Results are concatenated back in the input order. Runs in-process when the pool is
+    disabled or there are too few items to be worth the inter-process overhead.
+    """
+    executor = get_process_pool()
+    if executor is None or len(items) < settings.PROCESS_POOL_MIN_ITEMS:
+        return batch_func(items)
+
+    num_slices = min(settings.PROCESS_POOL_WORKERS, len(items))
+    slice_size, remainder = divmod(len(items), num_slices)
+
+    slices = []
+    start = 0
+    for index in range(num_slices):
+        end = start + slice_size + (1 if index < remainder else 0)
+        slices.append(items[start:end])
+        start = end
+
+    return flatten(executor.map(batch_func, slices))
@@ -12,6 +12,7 @@ from utils import compute_num_tokens, truncate_text_to_max_tokens
 from core import logger_utils
 from core.opik_utils import add_to_dataset_with_sampling
 from core.rag.retriever import VectorRetriever
+from core.rag.semantic_cache import SemanticCache
 from inference_pipeline.chatbots.chatbot_base import ChatbotBase
 
 logger = logger_utils.get_logger(__name__)
@@ -71,6 +72,11 @@ class ChatbotQwen(ChatbotBase):
             n_query_expansion=settings.EXPAND_N_QUERY,
             rerank=settings.ENABLE_RERANKING,
         )
+        self.semantic_cache = (
+            SemanticCache.from_settings(settings)
+            if settings.ENABLE_SEMANTIC_CACHE
+            else None
+        )
 
     @opik.track(name="inference_pipeline.generate")
     def generate(
@@ -89,11 +95,27 @@ class ChatbotQwen(ChatbotBase):
         )
         prompt_template_variables = {"question": query}
 
+        cached = None
+        query_vector = None
+        if enable_rag is True and self.semantic_cache is not None:
+            query_vector = self.retriever.embed_query(query)
+            cached = self.semantic_cache.lookup(query_vector)
+            if cached is not None and "answer" in cached:
+                opik_context.update_current_trace(tags=["rag", "semantic_cache"])
+
+                return {"answer": cached["answer"], "context": cached["context"]}
+
         if enable_rag is True:
-            hits = self.retriever.retrieve_top_k(query=query, k=settings.TOP_K)
-            context = self.retriever.rerank(
-                query=query, hits=hits, keep_top_k=settings.KEEP_TOP_K
-            )
+            if cached is not None:
+                context = cached["context"]
+            else:
+                # Reuse the embedding of the cache lookup instead of embedding the query again
+                hits = self.retriever.retrieve_top_k(
+                    query=query, k=settings.TOP_K, query_vector=query_vector
+                )
+                context = self.retriever.rerank(
+                    query=query, hits=hits, keep_top_k=settings.KEEP_TOP_K
+                )
             prompt_template_variables["context"] = context
         else:
             context = None
@@ -106,6 +128,16 @@ class ChatbotQwen(ChatbotBase):
         answer = self.call_llm_service(messages=messages)
         logger.debug(f"Answer: {answer}")
 
+        if (
+            enable_rag is True
+            and self.semantic_cache is not None
+            and cached is None
+            and not self._mock
+        ):
+            self.semantic_cache.store(
+                query=query, query_vector=query_vector, answer=answer, context=context
+            )
+
         num_answer_tokens = compute_num_tokens(answer)
         opik_context.update_current_trace(
             tags=["rag"],
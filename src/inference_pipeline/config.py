@@ -41,6 +41,21 @@ class AppSettings(BaseSettings):
     EXPAND_N_QUERY: int = 2
     ENABLE_SPARSE_EMBEDDING: bool = True
 
+    # Semantic cache config
+    ENABLE_SEMANTIC_CACHE: bool = False
+    # memory or sqlite (persisted and loaded back in memory on start)
+    SEMANTIC_CACHE_BACKEND: str = "memory"
+    SEMANTIC_CACHE_PATH: str = str(Path(ROOT_DIR) / ".cache" / "semantic_cache.sqlite")
+    SEMANTIC_CACHE_MAX_ITEMS: int = 1000
+    # Minimum cosine similarity between two queries to reuse the cached result
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95
+    # context: reuse the retrieved context only, the answer is generated for the new query.
+    # answer: reuse the whole response. Queries differing only by a dose, age group or drug
+    # can score above 0.95, so only use it with a threshold of at least 0.98 checked on real queries
+    SEMANTIC_CACHE_MODE: str = "context"
+    # The version marker of the vector collection is read at most this often
+    SEMANTIC_CACHE_VERSION_CHECK_SECONDS: float = 30.0
+
     # OpenAI config
     OPENAI_MODEL_ID: str = "gpt-4o-mini"
     OPENAI_API_KEY: str